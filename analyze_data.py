@@ -1,7 +1,8 @@
 import pandas as pd
+from dataset_store import load_dataframe
 
 def analyze():
-    df = pd.read_csv("data/Diseases_and_Symptoms_data.csv")
+    df = load_dataframe()
     
     targets = ["Dengue", "injury to the trunk", "Influenza", "Chicken pox"]
     
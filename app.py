@@ -15,6 +15,8 @@ import openai
 import json
 import speech_recognition as sr # Added for voice input
 import time # Added for potential future use or specific timing needs
+from symptom_profiles import SymptomProfiles
+from dataset_store import load_dataset
 
 # ================= FAST IMPORTS =================
 # Removed languages.py import as per instruction
@@ -172,11 +174,12 @@ def load_model():
     # Use mmap_mode='r' to prevent loading entire model into RAM at once
     model = joblib.load("disease_model.pkl", mmap_mode='r')
     le = joblib.load("label_encoder.pkl")
-    data = pd.read_csv("data/Diseases_and_Symptoms_data.csv")
-    symptoms = data.drop("diseases", axis=1).columns
-    return model, le, symptoms, data # Return data too
+    data = load_dataset() # Packed uint8 artifact instead of parsing the CSV
+    symptoms = data.columns
+    profiles = SymptomProfiles.from_dataset(data) # Disease x Symptom frequencies, built once
+    return model, le, symptoms, profiles
 
-model, le, symptoms_list, df_symptoms = load_model() # Unpack data
+model, le, symptoms_list, symptom_profiles = load_model()
 
 desc = pd.read_csv("data/description.csv")
 prec = pd.read_csv("data/precautions.csv")
@@ -305,43 +308,11 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 
 # ---------------- HELPER FUNCTIONS ----------------
 
-def get_discriminating_symptom(candidates, current_symptoms, asked_symptoms, data):
+def get_discriminating_symptom(candidates, current_symptoms, asked_symptoms, profiles):
     """Finds the symptom that best distinguishes between the candidate diseases."""
     try:
-        # Filter data for candidate diseases
-        subset = data[data['diseases'].isin(candidates)]
-        
-        if subset.empty:
-            return None
-            
-        # Calculate symptom frequencies for these diseases
-        # (Assuming dataset has 1s and 0s, mean gives probability/frequency)
-        symptom_stats = subset.drop('diseases', axis=1).mean()
-        
-        best_symptom = None
-        max_variance = -1
-        
-        for symptom, freq in symptom_stats.items():
-            # Skip if already known
-            if symptom in current_symptoms or symptom in asked_symptoms:
-                continue
-                
-            # We want a symptom that is present in some (~1.0) and absent in others (~0.0)
-            # Variance or simply closer to 0.5 mean generally implies split
-            # But specific to candidates:
-            # Let's verify variance across the *individual* candidate means
-            
-            # Group by disease to get the "typical profile" for each candidate
-            disease_profiles = subset.groupby('diseases')[symptom].mean()
-            variance = disease_profiles.var()
-            
-            if pd.isna(variance): variance = 0
-            
-            if variance > max_variance:
-                max_variance = variance
-                best_symptom = symptom
-                
-        return best_symptom
+        # One row-slice of the precomputed Disease x Symptom matrix, one variance reduction
+        return profiles.discriminating_symptom(candidates, current_symptoms, asked_symptoms)
     except Exception as e:
         st.error(f"Logic Error: {e}")
         return None
@@ -595,7 +566,7 @@ if VOICE_AVAILABLE:
         # Recover logic symptoms if missing (should be set in Input block, see below fix)
         current_logic_symptoms = st.session_state.get("logic_symptoms", [])
         
-        next_symptom = get_discriminating_symptom(c_names, current_logic_symptoms, st.session_state.asked_symptoms, df_symptoms)
+        next_symptom = get_discriminating_symptom(c_names, current_logic_symptoms, st.session_state.asked_symptoms, symptom_profiles)
         
         if next_symptom:
             st.write(f"### ❓ Do you also experience: **{next_symptom}**?")
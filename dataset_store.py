@@ -0,0 +1,121 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Packed binary artifact for the symptom dataset
+# Diseases_and_Symptoms_data.csv is ~246k rows x 378 columns; parsing it as
+# int64 on every process start is slow and keeps ~8 bytes per cell resident.
+# The build step stores the 0/1 matrix bit-packed (np.packbits) together with
+# the disease labels, the column names and the CSV checksum. Loading unpacks
+# to uint8 (1 byte per cell) and rebuilds automatically when the CSV changes.
+
+DATASET_CSV = os.path.join("data", "Diseases_and_Symptoms_data.csv")
+DATASET_ARTIFACT = os.path.join("data", "Diseases_and_Symptoms_data.npz")
+LABEL_COLUMN = "diseases"
+
+
+class SymptomDataset:
+    """X (uint8, rows x symptoms), integer label codes, label names and column names."""
+
+    def __init__(self, X, label_codes, label_names, columns):
+        self.X = X
+        self.label_codes = label_codes
+        self.label_names = label_names
+        self.columns = columns
+
+    @property
+    def labels(self):
+        """Disease name per row (materialized on demand)."""
+        return self.label_names[self.label_codes]
+
+    def to_frame(self):
+        """pandas view in the original CSV layout, for scripts that still want a DataFrame."""
+        df = pd.DataFrame(self.X, columns=self.columns, copy=False)
+        df.insert(0, LABEL_COLUMN, pd.Categorical.from_codes(self.label_codes, self.label_names))
+        return df
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_metadata(csv_path=DATASET_CSV):
+    """Fingerprint of the CSV stored inside every artifact derived from it."""
+    st = os.stat(csv_path)
+    return {
+        "checksum": np.array(file_checksum(csv_path)),
+        "csv_size": np.array(st.st_size),
+        "csv_mtime_ns": np.array(st.st_mtime_ns)
+    }
+
+
+def build_dataset_artifact(csv_path=DATASET_CSV, artifact_path=DATASET_ARTIFACT):
+    """Parses the CSV once and writes the packed artifact. Returns the loaded SymptomDataset."""
+    header = pd.read_csv(csv_path, nrows=0).columns.tolist()
+    columns = [c for c in header if c != LABEL_COLUMN]
+    dtypes = {c: np.uint8 for c in columns}
+    dtypes[LABEL_COLUMN] = "category"
+    df = pd.read_csv(csv_path, dtype=dtypes)
+
+    labels = df[LABEL_COLUMN].cat
+    label_names = np.asarray(labels.categories).astype(str)
+    label_codes = labels.codes.to_numpy().astype(np.int32)
+    X = df[columns].to_numpy(dtype=np.uint8)
+
+    np.savez_compressed(
+        artifact_path,
+        packed=np.packbits(X, axis=1),
+        n_columns=np.array(len(columns)),
+        label_codes=label_codes,
+        label_names=label_names,
+        columns=np.array(columns),
+        **source_metadata(csv_path)
+    )
+    print(f"Dataset artifact built: {X.shape[0]} rows x {X.shape[1]} symptoms -> {artifact_path}")
+    return SymptomDataset(X, label_codes, label_names, columns)
+
+
+def artifact_is_current(csv_path=DATASET_CSV, artifact_path=DATASET_ARTIFACT):
+    """
+    True if the artifact (dataset or anything saved with source_metadata) matches the CSV. Size + mtime is the fast path; only when
+    they differ is the CSV re-hashed (a touched but unchanged file stays current).
+    A deployed artifact without its CSV is treated as current.
+    """
+    if not os.path.exists(artifact_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    try:
+        with np.load(artifact_path, allow_pickle=False) as npz:
+            checksum = str(npz["checksum"])
+            size, mtime = int(npz["csv_size"]), int(npz["csv_mtime_ns"])
+    except Exception:
+        return False
+    st = os.stat(csv_path)
+    if st.st_size == size and st.st_mtime_ns == mtime:
+        return True
+    return file_checksum(csv_path) == checksum
+
+
+def load_dataset(csv_path=DATASET_CSV, artifact_path=DATASET_ARTIFACT):
+    """Shared loader for every entry point: artifact if current, otherwise (re)build it from the CSV."""
+    if not artifact_is_current(csv_path, artifact_path):
+        return build_dataset_artifact(csv_path, artifact_path)
+    with np.load(artifact_path, allow_pickle=False) as npz:
+        n_columns = int(npz["n_columns"])
+        X = np.unpackbits(npz["packed"], axis=1, count=n_columns)
+        return SymptomDataset(X, npz["label_codes"], npz["label_names"], npz["columns"].tolist())
+
+
+def load_dataframe(csv_path=DATASET_CSV, artifact_path=DATASET_ARTIFACT):
+    return load_dataset(csv_path, artifact_path).to_frame()
+
+
+if __name__ == "__main__":
+    # Build step: python dataset_store.py
+    build_dataset_artifact()
@@ -0,0 +1,130 @@
+import time
+import base64
+import secrets
+import threading
+import numpy as np
+
+from shared_state import SharedState
+
+# Server-side state for the /api/predict question loop
+# The symptom set and the asked set are bitsets over symptoms_list (np.packbits
+# layout, 48 bytes for ~377 symptoms), so each refinement turn only applies the
+# one new answer instead of the client re-sending both full lists. The last
+# posterior is kept too: a "no" answer does not change the model input, so the
+# next turn can reuse it without running the model at all.
+# Sessions are stored in shared_state.py's SQLite file, so any gunicorn worker
+# can serve the next turn (no sticky routing needed).
+
+
+class DiagnosisSession:
+    def __init__(self, session_id, owner, n_symptoms):
+        self.session_id = session_id
+        self.owner = owner
+        self.n_symptoms = n_symptoms
+        n_bytes = (n_symptoms + 7) // 8
+        self.present = np.zeros(n_bytes, dtype=np.uint8)
+        self.asked = np.zeros(n_bytes, dtype=np.uint8)
+        self.posterior = None
+        self.candidates = None
+        self.touched = time.time()
+
+    @staticmethod
+    def _set(bits, idx):
+        bits[idx >> 3] |= np.uint8(0x80 >> (idx & 7))
+
+    @staticmethod
+    def _has(bits, idx):
+        return bool(bits[idx >> 3] & (0x80 >> (idx & 7)))
+
+    def add_symptom(self, idx):
+        if not self._has(self.present, idx):
+            self._set(self.present, idx)
+            self.posterior = None # Model input changed
+
+    def mark_asked(self, idx):
+        self._set(self.asked, idx)
+
+    def apply_answer(self, idx, has_symptom):
+        self.mark_asked(idx)
+        if has_symptom:
+            self.add_symptom(idx)
+
+    def input_vector(self):
+        return np.unpackbits(self.present, count=self.n_symptoms).astype(np.float32)
+
+    def present_indices(self):
+        return np.flatnonzero(np.unpackbits(self.present, count=self.n_symptoms))
+
+    def asked_indices(self):
+        return np.flatnonzero(np.unpackbits(self.asked, count=self.n_symptoms))
+
+    def store_posterior(self, probs, candidates):
+        self.posterior = probs
+        self.candidates = candidates
+
+    def to_state(self):
+        posterior = None
+        if self.posterior is not None:
+            posterior = base64.b64encode(np.asarray(self.posterior, dtype=np.float64).tobytes()).decode("ascii")
+        return {"owner": self.owner, "n_symptoms": self.n_symptoms, "present": self.present.tobytes().hex(),
+                "asked": self.asked.tobytes().hex(), "posterior": posterior, "candidates": self.candidates}
+
+    @classmethod
+    def from_state(cls, session_id, state):
+        session = cls(session_id, state["owner"], state["n_symptoms"])
+        session.present = np.frombuffer(bytes.fromhex(state["present"]), dtype=np.uint8).copy()
+        session.asked = np.frombuffer(bytes.fromhex(state["asked"]), dtype=np.uint8).copy()
+        if state["posterior"] is not None:
+            session.posterior = np.frombuffer(base64.b64decode(state["posterior"]), dtype=np.float64)
+            session.candidates = state["candidates"]
+        return session
+
+
+class SessionStore:
+    """Expiring session id -> DiagnosisSession map shared by all worker processes (LRU past max_sessions)."""
+
+    def __init__(self, ttl_seconds=1800, max_sessions=10000, path=None):
+        self.ttl = ttl_seconds
+        self.max_sessions = max_sessions
+        kwargs = {"path": path} if path else {}
+        self._store = SharedState("diagnosis_sessions", ttl_seconds=ttl_seconds, max_entries=max_sessions, **kwargs)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+        self.saved = 0
+
+    def create(self, owner, n_symptoms):
+        """New session; it reaches the store (and other workers) on save()."""
+        with self._lock:
+            self.created += 1
+        return DiagnosisSession(secrets.token_urlsafe(16), owner, n_symptoms)
+
+    def get(self, session_id, owner):
+        """Session for this owner, or None if unknown / expired / someone else's."""
+        if not isinstance(session_id, str):
+            return None
+        found = self._store.get(session_id)
+        if found is None:
+            with self._lock:
+                self.expired += 1 # Unknown ids count too: the client has to resend its lists either way
+            return None
+        state, _ = found
+        if state.get("owner") != owner:
+            return None
+        return DiagnosisSession.from_state(session_id, state)
+
+    def save(self, session):
+        """Writes the session back after a turn (also renews its expiry)."""
+        session.touched = time.time()
+        if self._store.put(session.session_id, session.to_state()):
+            with self._lock:
+                self.saved += 1
+
+    def drop(self, session_id):
+        self._store.delete(session_id)
+
+    def stats(self):
+        with self._lock:
+            stats = {"created": self.created, "expired": self.expired, "saved": self.saved}
+        return dict(stats, active=len(self._store), max_sessions=self.max_sessions,
+                    ttl_seconds=self.ttl, errors=self._store.errors)
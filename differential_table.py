@@ -0,0 +1,215 @@
+import os
+import threading
+import numpy as np
+
+# Offline-materialized differential diagnosis table
+# Most /api/predict traffic starts from the same 1-3 symptom combinations. The
+# build step enumerates every single symptom plus the most frequent pairs and
+# triples in the training data (co-occurrence counts), runs them through the
+# model once and stores the top candidates and the first refinement question
+# per strategy. At serving time those inputs are a dict lookup; everything else
+# still goes to the model. The table is stamped with the model version and is
+# ignored once the model files change.
+
+TABLE_PATH = os.path.join("data", "differential_table.npz")
+MAX_PAIRS = int(os.environ.get("DIFF_TABLE_MAX_PAIRS", "5000"))
+MAX_TRIPLES = int(os.environ.get("DIFF_TABLE_MAX_TRIPLES", "5000"))
+TOP_K = 3 # Same as get_top_candidates in flask_app
+NOISE_FLOOR = 0.05
+NO_QUESTION = -1
+
+
+def cooccurrence_counts(X, chunk_rows=20000):
+    """Symptom x symptom co-occurrence counts of a 0/1 matrix (chunked, int32)."""
+    n = X.shape[1]
+    counts = np.zeros((n, n), dtype=np.int64)
+    for start in range(0, X.shape[0], chunk_rows):
+        block = X[start:start + chunk_rows].astype(np.int32)
+        counts += block.T @ block
+    return counts
+
+
+def frequent_pairs(counts, max_pairs, min_support=2):
+    """Most frequent symptom pairs (i < j) as an (n, 2) array."""
+    upper = np.triu(counts, k=1)
+    i, j = np.nonzero(upper >= min_support)
+    order = np.argsort(-upper[i, j], kind="stable")[:max_pairs]
+    return np.stack([i[order], j[order]], axis=1)
+
+
+def frequent_triples(X, pairs, max_triples, min_support=2):
+    """
+    Most frequent symptom triples, grown from the frequent pairs: for each pair
+    the rows containing both are summed to count every third symptom.
+    """
+    found = {}
+    for a, b in pairs:
+        rows = X[(X[:, a] == 1) & (X[:, b] == 1)]
+        if len(rows) < min_support:
+            continue
+        third = rows.sum(axis=0, dtype=np.int64)
+        third[[a, b]] = 0
+        for c in np.flatnonzero(third >= min_support):
+            key = tuple(sorted((int(a), int(b), int(c))))
+            found[key] = int(third[c])
+    ranked = sorted(found.items(), key=lambda kv: -kv[1])[:max_triples]
+    return np.array([k for k, _ in ranked], dtype=np.int64).reshape(-1, 3)
+
+
+class DifferentialTable:
+    """Symptom-set -> (top candidates, first question) lookup built by build_table()."""
+
+    def __init__(self, arrays):
+        self.symptoms = arrays["symptoms"].tolist()
+        self.label_names = arrays["label_names"]
+        self.model_version = str(arrays["model_version"])
+        self.strategies = arrays["strategies"].tolist()
+        self.cand_idx = arrays["cand_idx"]
+        self.cand_prob = arrays["cand_prob"]
+        self.questions = arrays["questions"]
+        self.symptom_index = {s: i for i, s in enumerate(self.symptoms)}
+        keys = arrays["keys"]
+        self.rows = {tuple(int(k) for k in key if k >= 0): row for row, key in enumerate(keys)}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path=TABLE_PATH):
+        with np.load(path, allow_pickle=False) as npz:
+            return cls({k: npz[k] for k in npz.files})
+
+    def __len__(self):
+        return len(self.rows)
+
+    def key_for(self, symptoms):
+        """Sorted feature indices of the known symptoms (the model input)."""
+        return tuple(sorted({self.symptom_index[s] for s in symptoms if s in self.symptom_index}))
+
+    def lookup(self, symptoms):
+        """{"candidates": [...], "questions": {strategy: symptom or None}} or None on a miss."""
+        row = self.rows.get(self.key_for(symptoms))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        candidates = [
+            {"disease": str(self.label_names[c]), "prob": float(p)}
+            for c, p in zip(self.cand_idx[row], self.cand_prob[row]) if c >= 0
+        ]
+        questions = {
+            strategy: (self.symptoms[q] if q != NO_QUESTION else None)
+            for strategy, q in zip(self.strategies, self.questions[row])
+        }
+        return {"candidates": candidates, "questions": questions}
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "entries": len(self.rows),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0
+        }
+
+
+def _load_model():
+    from tree_engine import CompiledForest, is_compiled_model_current
+    if is_compiled_model_current():
+        model = CompiledForest.load()
+        return model, model.labels
+    import joblib
+    return joblib.load("disease_model.pkl", mmap_mode='r'), joblib.load("label_encoder.pkl")
+
+
+def build_table(path=TABLE_PATH, max_pairs=MAX_PAIRS, max_triples=MAX_TRIPLES, batch_rows=1024):
+    from dataset_store import load_dataset
+    from symptom_profiles import SymptomProfiles
+    from prediction_cache import model_version
+
+    print("Loading data...")
+    dataset = load_dataset()
+    X = dataset.X
+    model, le = _load_model()
+    profiles = SymptomProfiles.from_dataset(dataset).aligned_to(le.classes_)
+    symptoms = list(profiles.symptoms)
+    n = len(symptoms)
+
+    print("Counting symptom co-occurrences...")
+    counts = cooccurrence_counts(X)
+    pairs = frequent_pairs(counts, max_pairs)
+    triples = frequent_triples(X, pairs, max_triples)
+    del dataset, X
+
+    keys = np.full((n + len(pairs) + len(triples), 3), -1, dtype=np.int32)
+    keys[:n, 0] = np.arange(n)
+    keys[n:n + len(pairs), :2] = pairs
+    keys[n + len(pairs):] = triples
+    print(f"Materializing {n} singles, {len(pairs)} pairs, {len(triples)} triples...")
+
+    strategies = ["variance", "eig"]
+    cand_idx = np.full((len(keys), TOP_K), -1, dtype=np.int32)
+    cand_prob = np.zeros((len(keys), TOP_K), dtype=np.float32)
+    questions = np.full((len(keys), len(strategies)), NO_QUESTION, dtype=np.int32)
+
+    for start in range(0, len(keys), batch_rows):
+        block = keys[start:start + batch_rows]
+        inputs = np.zeros((len(block), n), dtype=np.float32)
+        for r, key in enumerate(block):
+            inputs[r, key[key >= 0]] = 1
+        probs = model.predict_proba(inputs)
+
+        for r, (key, p) in enumerate(zip(block, probs)):
+            row = start + r
+            top = [c for c in np.argsort(p)[-TOP_K:][::-1] if p[c] > NOISE_FLOOR]
+            cand_idx[row, :len(top)] = top
+            cand_prob[row, :len(top)] = p[top]
+
+            # First refinement question, only needed when the answer is not final yet
+            if not top or p[top[0]] > 0.9 or len(top) == 1:
+                continue
+            current = [symptoms[i] for i in key if i >= 0]
+            names = [str(le.classes_[c]) for c in top]
+            by_strategy = {
+                "variance": profiles.discriminating_symptom(names, current, []),
+                "eig": profiles.information_gain_symptom(model.predict_proba, inputs[r], p, current, [])
+            }
+            for s, strategy in enumerate(strategies):
+                # EIG falls back to variance in the app when it finds nothing
+                q = by_strategy[strategy] or by_strategy["variance"]
+                if q is not None:
+                    questions[row, s] = profiles.symptom_index[q]
+
+    np.savez_compressed(
+        path,
+        keys=keys,
+        cand_idx=cand_idx,
+        cand_prob=cand_prob,
+        questions=questions,
+        strategies=np.array(strategies),
+        symptoms=np.array(symptoms),
+        label_names=np.asarray(le.classes_).astype(str),
+        model_version=np.array(model_version())
+    )
+    print(f"Saved {len(keys)} combinations to {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+def load_table(path=TABLE_PATH, expected_version=None):
+    """The table if it exists and was built from the current model files, else None."""
+    if not os.path.exists(path):
+        return None
+    table = DifferentialTable.load(path)
+    if expected_version is not None and table.model_version != expected_version:
+        print(f"Differential table is stale (built for another model), rebuild with: python {os.path.basename(__file__)}")
+        return None
+    return table
+
+
+if __name__ == "__main__":
+    # Build step (after training/exporting): python differential_table.py
+    build_table()
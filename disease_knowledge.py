@@ -0,0 +1,164 @@
+import os
+import ast
+import json
+import pandas as pd
+import medical_data
+import disease_resolver
+from medical_data import get_medical_info, match_medical_entry
+
+# Precompiled disease knowledge index
+# Final predictions and reports used to scan five CSVs and ast.literal_eval the
+# list columns on every request. The build step parses them once into a single
+# dict keyed by normalized disease name, merged with the medical_data metadata,
+# and writes it to data/disease_knowledge.json. Serving is a dict lookup.
+
+KNOWLEDGE_PATH = os.path.join("data", "disease_knowledge.json")
+
+# Field -> (CSV file, value column); precautions take every Precaution_* column
+SOURCES = {
+    "description": (os.path.join("data", "description.csv"), "Description"),
+    "precautions": (os.path.join("data", "precautions.csv"), None),
+    "medications": (os.path.join("data", "medications.csv"), "Medication"),
+    "diets": (os.path.join("data", "diets.csv"), "Diet"),
+    "workouts": (os.path.join("data", "workout.csv"), "Workouts"),
+}
+
+
+def normalize_name(disease):
+    return str(disease).strip().lower()
+
+
+def _parse_field(field, row, column):
+    if field == "description":
+        return row[column]
+    if field == "precautions":
+        return [str(val) for col, val in row.items() if 'Precaution' in col and pd.notna(val)]
+    # Safely evaluate string like "['drug1', 'drug2']"
+    return ast.literal_eval(row[column])
+
+
+def _source_fingerprint():
+    """Size + mtime of every input, so the serialized index knows when it is stale."""
+    paths = [path for path, _ in SOURCES.values()] + [medical_data.__file__, disease_resolver.__file__]
+    stamp = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamp[os.path.basename(path)] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            stamp[os.path.basename(path)] = None
+    return stamp
+
+
+def build_knowledge_index(known_diseases=()):
+    """
+    Parses all sources once. Returns (index, missing) where index maps the
+    normalized disease name to its merged info dict and missing maps each
+    source (plus "metadata") to the diseases it has no entry for.
+    """
+    parsed = {}
+    names = {}
+    for field, (path, column) in SOURCES.items():
+        parsed[field] = {}
+        try:
+            df = pd.read_csv(path)
+        except Exception as e:
+            print(f"Knowledge source unavailable ({path}): {e}")
+            continue
+        if column is not None and column not in df.columns:
+            # Tolerate singular/plural header variants (Workout vs Workouts)
+            column = next((c for c in df.columns if c != 'Disease' and c.rstrip('s') == column.rstrip('s')), column)
+        for _, row in df.iterrows():
+            key = normalize_name(row['Disease'])
+            if key in parsed[field]:
+                continue # First row wins, as with the old per-request scan
+            try:
+                parsed[field][key] = _parse_field(field, row, column)
+            except Exception as e:
+                print(f"Knowledge parse error ({field}, {row['Disease']}): {e}")
+                continue
+            names.setdefault(key, str(row['Disease']).strip())
+
+    for disease in known_diseases:
+        names.setdefault(normalize_name(disease), str(disease).strip())
+
+    index = {}
+    missing = {field: [] for field in SOURCES}
+    missing["metadata"] = []
+    for key, name in sorted(names.items()):
+        if key not in medical_data.medical_db and match_medical_entry(name)[0] is None:
+            missing["metadata"].append(name)
+        info = dict(get_medical_info(name))
+        for field in SOURCES:
+            if key in parsed[field]:
+                info[field] = parsed[field][key]
+            else:
+                missing[field].append(name)
+        index[key] = info
+    return index, missing
+
+
+def save_knowledge_index(index, missing, path=KNOWLEDGE_PATH):
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"sources": _source_fingerprint(), "missing": missing, "diseases": index}, f, ensure_ascii=False)
+    os.replace(tmp, path) # Several workers may rebuild at once; readers never see a partial file
+
+
+def report_missing(missing, limit=5):
+    for source, diseases in missing.items():
+        if diseases:
+            sample = ", ".join(diseases[:limit]) + (", ..." if len(diseases) > limit else "")
+            print(f"  {len(diseases)} disease(s) missing from {source}: {sample}")
+
+
+class DiseaseKnowledge:
+    """O(1) disease -> merged info lookup (description, precautions, medications, diets, workouts + metadata)."""
+
+    def __init__(self, index, missing=None):
+        self.index = index
+        self.missing = missing or {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, disease):
+        """Info dict for disease (a fresh copy, callers may add fields); metadata-only if unknown."""
+        info = self.index.get(normalize_name(disease))
+        if info is None:
+            return dict(get_medical_info(disease))
+        return dict(info)
+
+
+def load_knowledge_index(path=KNOWLEDGE_PATH, known_diseases=()):
+    """Serialized index if it is up to date with its sources, otherwise rebuilt (and re-saved)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("sources") == _source_fingerprint():
+            return DiseaseKnowledge(saved["diseases"], saved.get("missing"))
+    except (OSError, ValueError):
+        pass
+
+    index, missing = build_knowledge_index(known_diseases)
+    print(f"Knowledge index built: {len(index)} diseases")
+    report_missing(missing)
+    try:
+        save_knowledge_index(index, missing, path)
+    except OSError as e:
+        print(f"Could not save knowledge index: {e}")
+    return DiseaseKnowledge(index, missing)
+
+
+if __name__ == "__main__":
+    # Build step: python disease_knowledge.py
+    try:
+        # Also report model diseases that have no entry in any source
+        import joblib
+        known = joblib.load("label_encoder.pkl").classes_
+    except Exception:
+        known = ()
+    index, missing = build_knowledge_index(known)
+    save_knowledge_index(index, missing)
+    print(f"Saved {len(index)} diseases to {KNOWLEDGE_PATH}")
+    report_missing(missing, limit=50)
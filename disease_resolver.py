@@ -0,0 +1,108 @@
+import re
+import threading
+
+# Fuzzy disease-name resolver
+# The model predicts ~770 disease labels but the metadata (medical_data) and
+# specialist (doctor_service) tables only know a few dozen names, often spelled
+# differently ("Osteoarthritis" vs "osteoarthristis", "Alcoholic hepatitis" vs
+# "hepatitis"). The resolver indexes the table keys by token, and tokens by
+# character trigrams for misspellings, so a label is scored only against the
+# keys it shares a token with. Results are memoized per label: the label set is
+# fixed for a given model, so after warm-up every lookup is a dict hit.
+
+MIN_SCORE = 0.7 # Below this the label is treated as unknown
+TOKEN_MATCH = 0.6 # Trigram similarity for two tokens to count as the same word
+MAX_MEMO = 4096
+
+
+def tokenize(name):
+    return [t for t in re.split(r"[^a-z0-9]+", str(name).lower()) if t]
+
+
+def trigrams(token):
+    padded = f"#{token}#"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+
+class DiseaseNameResolver:
+    """
+    Maps free-form disease labels onto the keys of a lookup table.
+    resolve(label) -> (key, score) with score in (0, 1], or (None, 0.0).
+    """
+
+    def __init__(self, keys, min_score=MIN_SCORE):
+        self.min_score = min_score
+        self.exact = {" ".join(tokenize(k)): k for k in keys}
+        self.key_tokens = {k: set(tokenize(k)) for k in keys}
+        self.token_index = {} # token -> keys containing it
+        for key, tokens in self.key_tokens.items():
+            for token in tokens:
+                self.token_index.setdefault(token, set()).add(key)
+        self.trigram_index = {} # trigram -> vocabulary tokens containing it
+        self.token_trigrams = {}
+        for token in self.token_index:
+            grams = trigrams(token)
+            self.token_trigrams[token] = grams
+            for gram in grams:
+                self.trigram_index.setdefault(gram, set()).add(token)
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def _token_matches(self, token):
+        """Vocabulary tokens equal or close (misspelling) to token, with a similarity weight."""
+        matches = {token: 1.0} if token in self.token_index else {}
+        if len(token) < 4:
+            return matches # Short tokens ("a", "b", "ii") must match exactly
+        # Misspelled keys too: "disease" must still reach "peptic ulcer diseae"
+        grams = trigrams(token)
+        nearby = set().union(*(self.trigram_index.get(g, ()) for g in grams))
+        for other in nearby:
+            if other not in matches:
+                sim = _dice(grams, self.token_trigrams[other])
+                if sim >= TOKEN_MATCH:
+                    matches[other] = sim
+        return matches
+
+    def _score(self, label):
+        tokens = tokenize(label)
+        if not tokens:
+            return None, 0.0
+        exact = self.exact.get(" ".join(tokens))
+        if exact is not None:
+            return exact, 1.0
+
+        # Best similarity per (key, key token) over the label's tokens
+        covered = {}
+        for token in set(tokens):
+            for vocab_token, sim in self._token_matches(token).items():
+                for key in self.token_index[vocab_token]:
+                    per_key = covered.setdefault(key, {})
+                    per_key[vocab_token] = max(per_key.get(vocab_token, 0.0), sim)
+
+        best, best_score = None, 0.0
+        n_label = len(set(tokens))
+        for key, matched in covered.items():
+            weight = sum(matched.values())
+            # Mostly "how much of the key is in the label" (old substring rule), a bit of the reverse
+            score = 0.7 * weight / len(self.key_tokens[key]) + 0.3 * min(1.0, weight / n_label)
+            # Ties go to the more specific (longer) key
+            if score > best_score or (score == best_score and best is not None and len(key) > len(best)):
+                best, best_score = key, score
+        if best_score < self.min_score:
+            return None, 0.0
+        return best, round(best_score, 4)
+
+    def resolve(self, label):
+        cached = self._memo.get(label)
+        if cached is not None:
+            return cached
+        result = self._score(label)
+        with self._lock:
+            if len(self._memo) >= MAX_MEMO:
+                self._memo.clear()
+            self._memo[label] = result
+        return result
@@ -3,6 +3,7 @@ import os
 import re
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut
+from disease_resolver import DiseaseNameResolver
 
 # Global cache for doctor data
 DOCTORS_DATA = None
@@ -66,6 +67,16 @@ SPECIALIST_MAPPING = {
     "pcos": "Gynecologist"
 }
 
+# Token/trigram index over SPECIALIST_MAPPING keys (memoized per disease label)
+_specialist_resolver = DiseaseNameResolver(SPECIALIST_MAPPING)
+
+def specialist_for_disease(disease_name):
+    """(specialist, confidence); General Physician with confidence 0.0 if nothing matches."""
+    key, score = _specialist_resolver.resolve(disease_name)
+    if key is None:
+        return "General Physician", 0.0
+    return SPECIALIST_MAPPING[key], score
+
 def load_data():
     global DOCTORS_DATA
     if DOCTORS_DATA:
@@ -128,21 +139,9 @@ def find_doctors_for_disease(lat, lng, disease_name):
     normalized_user_city = user_city.lower()
     
     # 2. Determine Specialist
-    needed_specialist = "General Physician"
-    # Basic fuzzy match or direct lookup
-    disease_lower = disease_name.lower().strip()
-    
-    # Direct match
-    if disease_lower in SPECIALIST_MAPPING:
-        needed_specialist = SPECIALIST_MAPPING[disease_lower]
-    else:
-        # Partial match
-        for key, val in SPECIALIST_MAPPING.items():
-            if key in disease_lower:
-                needed_specialist = val
-                break
+    needed_specialist, match_score = specialist_for_disease(disease_name)
                 
-    print(f"Logic: User City='{user_city}', Disease='{disease_name}' -> Specialist='{needed_specialist}'")
+    print(f"Logic: User City='{user_city}', Disease='{disease_name}' -> Specialist='{needed_specialist}' (match {match_score})")
     
     # 3. Filter Doctors
     doctors = load_data()
@@ -178,6 +177,7 @@ def find_doctors_for_disease(lat, lng, disease_name):
         "status": "success",
         "city_detected": user_city,
         "specialist_required": needed_specialist,
+        "specialist_match_score": match_score,
         "count": len(final_list),
         "doctors": final_list[:10] # Top 10
     }
@@ -0,0 +1,169 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Response cache for /api/explain_disease with stale-while-revalidate
+# An explanation for (disease, language) is served from memory for ttl
+# seconds. After that the stale copy is still returned immediately while one
+# background refresh fetches a new one, so only the very first request for a
+# pair (or one after eviction) waits on the LLM. Failed fetches are never
+# cached: the caller falls back to its offline text and the next request
+# tries again.
+# With a `shared` store (shared_state.SharedState) every stored value is also
+# written there, and a worker that misses or holds a stale copy adopts a newer
+# one from it, so one worker's fetch or pre-warm serves all of them.
+
+
+class ExplanationCache:
+    def __init__(self, ttl_seconds=24 * 3600, max_entries=2000, refresh_workers=2, shared=None):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries = OrderedDict() # key -> (value, fetched_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="explain-refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.warmed = 0
+        self.evictions = 0
+        self.shared_hits = 0
+
+    def _remember(self, key, value, fetched_at):
+        with self._lock:
+            self._entries[key] = (value, fetched_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _store(self, key, value):
+        self._remember(key, value, time.time())
+        if self.shared is not None:
+            self.shared.put(json.dumps(key), value)
+
+    def _lookup(self, key):
+        """(value, fetched_at) from memory, or from the shared store when that is missing or stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if self.shared is None or (entry is not None and time.time() - entry[1] <= self.ttl):
+            return entry
+        found = self.shared.get(json.dumps(key))
+        if found is None:
+            return entry
+        value, age = found
+        fetched_at = time.time() - age
+        if entry is not None and entry[1] >= fetched_at - 0.01: # Same write seen twice (clock rounding)
+            return entry
+        self._remember(key, value, fetched_at) # Another worker fetched it
+        with self._lock:
+            self.shared_hits += 1
+        return value, fetched_at
+
+    def _refresh(self, key, fetch, counter="refreshes"):
+        try:
+            value = fetch()
+            self._store(key, value)
+            with self._lock:
+                setattr(self, counter, getattr(self, counter) + 1)
+        except Exception as e:
+            print(f"Explanation Refresh Error {key}: {e}")
+            with self._lock:
+                self.refresh_errors += 1 # Keep serving the stale copy
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule(self, key, fetch, counter="refreshes"):
+        """Starts one background fetch for key unless one is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+        try:
+            self._pool.submit(self._refresh, key, fetch, counter)
+        except RuntimeError: # Interpreter shutting down
+            with self._lock:
+                self._refreshing.discard(key)
+            return False
+        return True
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Returns (value, state) with state "hit", "stale" or "miss".
+        On a miss fetch() runs in the caller; its exceptions propagate.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            value, fetched_at = entry
+            if time.time() - fetched_at <= self.ttl:
+                with self._lock:
+                    self.hits += 1
+                return value, "hit"
+            with self._lock:
+                self.stale_hits += 1
+            self._schedule(key, fetch)
+            return value, "stale"
+
+        with self._lock:
+            self.misses += 1
+        value = fetch()
+        self._store(key, value)
+        return value, "miss"
+
+    def peek(self, key, fetch):
+        """
+        Cached value or None, never fetching in the caller (it streams a new one on None).
+        A stale value is returned too, with fetch() scheduled in the background as in get_or_fetch.
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        value, fetched_at = entry
+        if time.time() - fetched_at <= self.ttl:
+            with self._lock:
+                self.hits += 1
+            return value
+        with self._lock:
+            self.stale_hits += 1
+        self._schedule(key, fetch)
+        return value
+
+    def put(self, key, value):
+        """Stores a value produced outside get_or_fetch (e.g. a finished stream)."""
+        self._store(key, value)
+
+    def warm(self, key, fetch):
+        """Fetches key in the background if it is missing or stale."""
+        entry = self._lookup(key)
+        if entry is not None and time.time() - entry[1] <= self.ttl:
+            return False
+        return self._schedule(key, fetch, counter="warmed")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "refreshing": len(self._refreshing),
+                "warmed": self.warmed,
+                "evictions": self.evictions,
+                "shared_hits": self.shared_hits,
+                "shared": self.shared is not None
+            }
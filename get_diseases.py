@@ -1,8 +1,9 @@
 import pandas as pd
 import joblib
+from dataset_store import load_dataframe
 
 # Load data to get unique diseases
-df = pd.read_csv("data/Diseases_and_Symptoms_data.csv")
+df = load_dataframe()
 diseases = df['diseases'].unique()
 
 print("List of Diseases:")
@@ -0,0 +1,43 @@
+# Multi-worker serving entry point
+#   gunicorn -c gunicorn.conf.py flask_app:app
+#
+# The master publishes the compiled model and the profile matrix ONCE as
+# .npy files (shared_store.py); every worker memory-maps them read-only, so
+# adding workers scales throughput without multiplying model RAM.
+# Requires the compiled model (python train_model.py --export). Linux/macOS only.
+import os
+
+SHARED_ARRAYS_DIR = os.environ.setdefault("SHARED_ARRAYS_DIR", os.path.join("data", "shared"))
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+threads = int(os.environ.get("WORKER_THREADS", "4"))
+timeout = 60
+# Each worker imports flask_app itself and attaches to the shared arrays
+preload_app = False
+
+
+def on_starting(server):
+    from shared_store import attach_or_publish, remove_stale_versions
+    from symptom_profiles import ensure_profile_artifact, PROFILE_PATH
+    from tree_engine import is_compiled_model_current, COMPILED_MODEL_PATH
+
+    ensure_profile_artifact()
+    attach_or_publish("profiles", PROFILE_PATH, SHARED_ARRAYS_DIR)
+    remove_stale_versions("profiles", PROFILE_PATH, SHARED_ARRAYS_DIR)
+    if is_compiled_model_current():
+        attach_or_publish("forest", COMPILED_MODEL_PATH, SHARED_ARRAYS_DIR)
+        remove_stale_versions("forest", COMPILED_MODEL_PATH, SHARED_ARRAYS_DIR)
+        server.log.info(f"Published shared model arrays to {SHARED_ARRAYS_DIR}")
+    else:
+        server.log.warning("Compiled model missing/stale: each worker will load its own disease_model.pkl")
+
+
+def post_worker_init(worker):
+    # Explanation pre-warm once per server, not once per worker: worker ages
+    # start at 1, respawned workers get higher ones. The explanation cache is
+    # written through to data/shared_state.sqlite3, so the other (and any
+    # replacement) workers read the warmed entries from there.
+    if worker.age == 1:
+        import flask_app
+        flask_app.start_prewarm()
@@ -0,0 +1,233 @@
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from urllib import request as urlrequest
+from urllib.error import HTTPError
+
+# Pluggable LLM backends
+# Everything that talks to Gemini (flask_app through LLMGateway, pretranslate)
+# only needs model.generate_content(contents, stream=False) returning an
+# object with .text (or an iterable of them when streaming). create_model()
+# picks the implementation from LLM_BACKEND:
+#   gemini   google.generativeai, GEMINI_API_KEY (default)
+#   standin  in-process StandInLLM: deterministic answers, no network
+#   http     StandInLLM served by standin_server.py at LLM_STANDIN_URL
+# Stand-in knobs (env or constructor): LLM_STANDIN_LATENCY (see LatencyModel),
+# LLM_STANDIN_ERROR_RATE, LLM_STANDIN_TIMEOUT_RATE (calls that hang for
+# LLM_STANDIN_HANG_SECONDS, to exercise the gateway deadlines), LLM_STANDIN_SEED.
+
+STANDIN_URL = "http://127.0.0.1:8765"
+
+
+def gemini_model(api_key=None):
+    import google.generativeai as genai
+    genai.configure(api_key=api_key if api_key is not None else os.environ.get("GEMINI_API_KEY", ""))
+    return genai.GenerativeModel('gemini-1.5-flash')
+
+
+class StandInResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class LatencyModel:
+    """
+    Latency distribution from a spec string (milliseconds):
+      fixed:MS | uniform:LOW:HIGH | normal:MEAN:SD | lognormal:MEDIAN:SIGMA
+    lognormal gives the long right tail real APIs have.
+    """
+
+    def __init__(self, spec="fixed:50"):
+        self.spec = spec
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"Bad latency spec '{spec}' (fixed:MS, uniform:LOW:HIGH, normal:MEAN:SD, lognormal:MEDIAN:SIGMA)")
+
+    def sample(self, rng):
+        """Seconds."""
+        p = self.params
+        if self.kind == "fixed":
+            ms = p[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            ms = rng.gauss(p[0], p[1])
+        else:
+            ms = p[0] * rng.lognormvariate(0.0, p[1])
+        return max(0.0, ms) / 1000.0
+
+
+def prompt_text(contents):
+    """(text of the prompt, whether an image was attached) for str or [text, image, ...] contents."""
+    if isinstance(contents, str):
+        return contents, False
+    parts = list(contents)
+    return "\n".join(p for p in parts if isinstance(p, str)), any(not isinstance(p, str) for p in parts)
+
+
+def _tag(value, language):
+    if isinstance(value, str):
+        return f"[{language}] {value}"
+    if isinstance(value, list):
+        return [_tag(v, language) for v in value]
+    if isinstance(value, dict):
+        return {k: _tag(v, language) for k, v in value.items()}
+    return value
+
+
+def _mentioned(text, vocabulary):
+    text = text.lower()
+    return [name for name in vocabulary if name and name.lower() in text]
+
+
+def standin_reply(prompt, has_image=False):
+    """
+    Deterministic answer in the shape each call site parses: translated JSON
+    for translate_info, symptom arrays/objects for extraction, text otherwise.
+    """
+    if has_image:
+        return ("Simulated Analysis Report:\n1. Observation: No critical abnormalities detected.\n"
+                "2. Advice: Please consult a specialist for a real diagnosis.")
+
+    if "Target Language: " in prompt and "Data: " in prompt:
+        language = prompt.split("Target Language: ", 1)[1].split("\n", 1)[0]
+        data = json.loads(prompt.split("Data: ", 1)[1])
+        return "```json\n" + json.dumps(_tag(data, language), ensure_ascii=False) + "\n```"
+
+    official = re.search(r"official list: (.*)", prompt)
+    vocabulary = official.group(1).split(", ") if official else []
+    if "Patient Inputs:" in prompt: # Grouped extraction
+        answer = {}
+        for number, quoted in re.findall(r'^(\d+)\. (".*")$', prompt, re.M):
+            answer[number] = _mentioned(json.loads(quoted), vocabulary)
+        return json.dumps(answer, ensure_ascii=False)
+    single = re.search(r"Patient Input: (.*?)\n\nExtracted", prompt, re.S)
+    if single:
+        return json.dumps(_mentioned(single.group(1), vocabulary), ensure_ascii=False)
+
+    subject = re.search(r"'([^']+)'", prompt)
+    subject = subject.group(1) if subject else "the condition"
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    sections = ["OVERVIEW", "CAUSES", "SYMPTOMS", "DIAGNOSIS", "TREATMENT", "PREVENTION"]
+    body = "\n".join(f"{i}. {name}: Stand-in text about {subject} ({name.lower()})."
+                     for i, name in enumerate(sections, 1))
+    return f"[stand-in {digest}] {subject}\n\n{body}"
+
+
+class StandInLLM:
+    """Local replacement for the Gemini model with injected latency, errors and hangs."""
+
+    def __init__(self, latency="fixed:50", error_rate=0.0, timeout_rate=0.0, hang_seconds=60.0, seed=0, chunk_chars=40):
+        self.latency = latency if isinstance(latency, LatencyModel) else LatencyModel(latency)
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.chunk_chars = chunk_chars
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.hangs = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            latency=os.environ.get("LLM_STANDIN_LATENCY", "lognormal:300:0.5"),
+            error_rate=float(os.environ.get("LLM_STANDIN_ERROR_RATE", "0")),
+            timeout_rate=float(os.environ.get("LLM_STANDIN_TIMEOUT_RATE", "0")),
+            hang_seconds=float(os.environ.get("LLM_STANDIN_HANG_SECONDS", "60")),
+            seed=int(os.environ.get("LLM_STANDIN_SEED", "0"))
+        )
+
+    def _draw(self):
+        """(fate, delay seconds) for the next call; one seeded stream so runs are reproducible."""
+        with self._lock:
+            self.calls += 1
+            roll = self._random.random()
+            delay = self.latency.sample(self._random)
+            if roll < self.timeout_rate:
+                self.hangs += 1
+                return "hang", delay
+            if roll < self.timeout_rate + self.error_rate:
+                self.errors += 1
+                return "error", delay
+            return "ok", delay
+
+    def generate_content(self, contents, stream=False, **kwargs):
+        prompt, has_image = prompt_text(contents)
+        fate, delay = self._draw()
+        if fate == "hang":
+            time.sleep(self.hang_seconds)
+            raise TimeoutError("stand-in LLM: injected hang")
+        if stream:
+            return self._stream(standin_reply(prompt, has_image), delay, fate)
+        time.sleep(delay)
+        if fate == "error":
+            raise RuntimeError("stand-in LLM: injected failure")
+        return StandInResponse(standin_reply(prompt, has_image))
+
+    def _stream(self, text, delay, fate):
+        """Time to first chunk ~ delay / 2, the rest spread over the other half."""
+        pieces = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)] or [""]
+        time.sleep(delay / 2)
+        for n, piece in enumerate(pieces):
+            if fate == "error" and n == len(pieces) // 2:
+                raise RuntimeError("stand-in LLM: injected failure mid-stream")
+            yield StandInResponse(piece)
+            time.sleep(delay / 2 / len(pieces))
+
+    def stats(self):
+        with self._lock:
+            return {"latency": self.latency.spec, "calls": self.calls, "errors": self.errors, "hangs": self.hangs}
+
+
+class HTTPStandInLLM:
+    """Client for standin_server.py, so the stand-in's latency happens in another process."""
+
+    def __init__(self, url=STANDIN_URL, timeout=120.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, prompt, has_image, stream):
+        body = json.dumps({"prompt": prompt, "image": has_image, "stream": stream}).encode("utf-8")
+        req = urlrequest.Request(f"{self.url}/generate", data=body, headers={"Content-Type": "application/json"})
+        try:
+            return urlrequest.urlopen(req, timeout=self.timeout)
+        except HTTPError as e:
+            raise RuntimeError(f"stand-in server: HTTP {e.code} {e.read().decode('utf-8', 'replace')[:200]}")
+
+    def generate_content(self, contents, stream=False, **kwargs):
+        prompt, has_image = prompt_text(contents)
+        resp = self._post(prompt, has_image, stream)
+        if stream:
+            return self._stream(resp)
+        with resp:
+            return StandInResponse(json.loads(resp.read())["text"])
+
+    def _stream(self, resp):
+        with resp:
+            for line in resp: # One JSON object per chunk
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if "error" in event:
+                    raise RuntimeError(f"stand-in server: {event['error']}")
+                yield StandInResponse(event["text"])
+
+
+def create_model(backend=None, api_key=None):
+    backend = backend or os.environ.get("LLM_BACKEND", "gemini")
+    if backend == "standin":
+        return StandInLLM.from_env()
+    if backend == "http":
+        return HTTPStandInLLM(os.environ.get("LLM_STANDIN_URL", STANDIN_URL))
+    if backend == "gemini":
+        return gemini_model(api_key)
+    raise ValueError(f"Unknown LLM_BACKEND '{backend}' (gemini, standin, http)")
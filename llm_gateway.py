@@ -0,0 +1,402 @@
+import re
+import time
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+# Shared gateway for every Gemini call
+# Each call site (translate_info, extract_symptoms, explain_disease,
+# generate_report, analyze_image) goes through LLMGateway.generate_text():
+#   - a per-call deadline: the request thread stops waiting after `timeout`
+#     seconds and takes its offline fallback,
+#   - a semaphore bounding in-flight upstream calls (a slot is only released
+#     when the upstream call really returns, so abandoned calls still count),
+#   - a circuit breaker: after `failure_threshold` consecutive failures calls
+#     fail fast for `reset_timeout` seconds, then one probe call is let through.
+# stream_text() is the same for generate_content(stream=True): chunks are
+# yielded as they arrive and the deadline applies to the gap between chunks.
+# Identical text prompts that are in flight at the same time are coalesced
+# (single flight) in both generate_text() and stream_text(): the first caller
+# makes the upstream call and the others wait on its result (streams: replay
+# its chunks from the start, then follow it live), each with its own deadline,
+# so a burst of users getting the same disease costs one Gemini call instead
+# of N. A flight only takes new followers until its leader's deadline (streams:
+# until `timeout` after the last chunk); after that the next identical call
+# starts a fresh upstream call (and goes through the breaker) instead of
+# waiting on a call that may be hung.
+# Every failure is an LLMError subclass, so existing `except Exception`
+# fallbacks keep working unchanged.
+
+LATENCY_WINDOW = 512 # Recent samples per call site for the percentiles
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMTimeoutError(LLMError):
+    pass
+
+
+class LLMBusyError(LLMError):
+    """All concurrency slots taken for longer than the call's deadline."""
+
+
+class CircuitOpenError(LLMError):
+    """Upstream marked unhealthy; skipping the call."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True # Exactly one probe while half open
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def cancel_probe(self):
+        """The probe call never reached upstream (no free slot); let the next call probe."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opens += 1
+                self.state = "open"
+                self.opened_at = time.time()
+                self._probing = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "opens": self.opens,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout_seconds": self.reset_timeout
+            }
+
+
+class CallSiteMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.short_circuited = 0
+        self.coalesced = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def snapshot(self):
+        ordered = sorted(self.latencies)
+
+        def pct(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1) if ordered else None
+
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "short_circuited": self.short_circuited,
+            "coalesced": self.coalesced,
+            "latency_ms": {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "samples": len(ordered)}
+        }
+
+
+class StreamFlight:
+    """Chunks of one upstream stream, replayed to every caller coalesced onto it."""
+
+    def __init__(self):
+        self.chunks = []
+        self.finished = False
+        self.error = None
+        self._cond = threading.Condition()
+
+    def add(self, text):
+        with self._cond:
+            self.chunks.append(text)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.finished = True
+            self.error = error
+            self._cond.notify_all()
+
+    def read(self, index, timeout):
+        """(chunks from index on, finished), or None if nothing new arrived within timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self.chunks) > index or self.finished, timeout):
+                return None
+            return self.chunks[index:], self.finished
+
+
+def flight_key(site, contents, kwargs):
+    """Hash of the whitespace-normalized prompt, or None for multimodal contents (not coalesced)."""
+    if not isinstance(contents, str):
+        return None
+    prompt = re.sub(r"\s+", " ", contents).strip()
+    blob = f"{site}\n{sorted(kwargs.items())!r}\n{prompt}"
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMGateway:
+    def __init__(self, model, max_concurrency=8, default_timeout=20.0, timeouts=None, breaker=None, single_flight=True):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.timeouts = dict(timeouts or {})
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.single_flight = single_flight
+        self._flights = {} # flight key -> (Future / StreamFlight shared by identical concurrent calls, join deadline)
+
+    def _site(self, site):
+        with self._lock:
+            return self._metrics.setdefault(site, CallSiteMetrics())
+
+    def _count(self, metrics, field, latency=None):
+        with self._lock:
+            setattr(metrics, field, getattr(metrics, field) + 1)
+            if latency is not None:
+                metrics.latencies.append(latency)
+
+    def _call(self, contents, kwargs):
+        with self._lock:
+            self.in_flight += 1
+        try:
+            return self.model.generate_content(contents, **kwargs).text
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def _join_flight(self, key, timeout, factory=Future):
+        """(flight, is_leader): the live in-flight flight for key, or a new one this caller must resolve."""
+        now = time.time()
+        with self._lock:
+            entry = self._flights.get(key)
+            if entry is not None and now < entry[1]:
+                return entry[0], False
+            flight = factory() # A flight past its leader's deadline is replaced, not joined
+            self._flights[key] = (flight, now + timeout)
+            return flight, True
+
+    def _extend_flight(self, key, flight, timeout):
+        """Keeps a stream flight joinable while its chunks keep arriving."""
+        with self._lock:
+            entry = self._flights.get(key)
+            if entry is not None and entry[0] is flight:
+                self._flights[key] = (flight, time.time() + timeout)
+
+    def _drop_flight(self, key, flight):
+        with self._lock:
+            entry = self._flights.get(key)
+            if entry is not None and entry[0] is flight:
+                del self._flights[key]
+
+    def _land(self, key, flight, result=None, error=None):
+        self._drop_flight(key, flight)
+        if error is not None:
+            flight.set_exception(error)
+        else:
+            flight.set_result(result)
+
+    def _follow(self, site, metrics, flight, timeout):
+        """Waits on another caller's identical upstream call; the breaker is left to the leader."""
+        self._count(metrics, "coalesced")
+        started = time.time()
+        try:
+            text = flight.result(timeout=timeout)
+        except FutureTimeout:
+            self._count(metrics, "timeouts", time.time() - started)
+            raise LLMTimeoutError(f"{site} exceeded {timeout}s")
+        except Exception:
+            self._count(metrics, "errors", time.time() - started)
+            raise
+        self._count(metrics, "successes", time.time() - started)
+        return text
+
+    def generate_text(self, site, contents, timeout=None, **kwargs):
+        """response.text of model.generate_content(contents), or an LLMError / upstream exception."""
+        metrics = self._site(site)
+        self._count(metrics, "calls")
+        timeout = timeout or self.timeouts.get(site, self.default_timeout)
+
+        key = flight_key(site, contents, kwargs) if self.single_flight else None
+        flight = None
+        if key is not None:
+            flight, leader = self._join_flight(key, timeout)
+            if not leader:
+                return self._follow(site, metrics, flight, timeout)
+
+        if not self.breaker.allow():
+            self._count(metrics, "short_circuited")
+            error = CircuitOpenError(f"LLM circuit open, skipping {site}")
+            if flight is not None:
+                self._land(key, flight, error=error)
+            raise error
+
+        started = time.time()
+        if not self._slots.acquire(timeout=timeout):
+            self.breaker.cancel_probe()
+            self._count(metrics, "rejected")
+            error = LLMBusyError(f"No free LLM slot for {site} within {timeout}s")
+            if flight is not None:
+                self._land(key, flight, error=error)
+            raise error
+
+        future = self._pool.submit(self._call, contents, kwargs)
+        if flight is not None:
+            # Followers get the upstream result even if this caller stops waiting first
+            def land(done):
+                error = done.exception()
+                self._land(key, flight, result=None if error else done.result(), error=error)
+            future.add_done_callback(land)
+        try:
+            text = future.result(timeout=max(0.0, timeout - (time.time() - started)))
+        except FutureTimeout:
+            if flight is not None:
+                self._drop_flight(key, flight) # Followers already waiting keep their own deadline
+            self.breaker.record_failure()
+            self._count(metrics, "timeouts", time.time() - started)
+            raise LLMTimeoutError(f"{site} exceeded {timeout}s")
+        except Exception:
+            self.breaker.record_failure()
+            self._count(metrics, "errors", time.time() - started)
+            raise
+        self.breaker.record_success()
+        self._count(metrics, "successes", time.time() - started)
+        return text
+
+    def _pump(self, key, contents, kwargs, flight, timeout):
+        """Runs a streaming call on a pool thread, handing chunks to the flight's readers."""
+        with self._lock:
+            self.in_flight += 1
+        error = None
+        try:
+            for part in self.model.generate_content(contents, stream=True, **kwargs):
+                text = part.text
+                if text:
+                    flight.add(text)
+                    self._extend_flight(key, flight, timeout)
+        except Exception as e:
+            error = e
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+            self._drop_flight(key, flight) # Later identical calls start a fresh stream
+            flight.finish(error)
+
+    def _replay(self, site, metrics, flight, timeout, key=None, leader=False):
+        """Yields a stream flight's chunks as they arrive; only the leader updates the breaker."""
+        started = time.time()
+        index = 0
+        while True:
+            got = flight.read(index, timeout)
+            if got is None:
+                if leader:
+                    self._drop_flight(key, flight) # Followers already reading keep their own deadline
+                    self.breaker.record_failure()
+                self._count(metrics, "timeouts", time.time() - started)
+                raise LLMTimeoutError(f"{site} stalled for more than {timeout}s")
+            chunks, finished = got
+            for chunk in chunks:
+                index += 1
+                try:
+                    yield chunk
+                except GeneratorExit: # Client went away; the pump drains on its own
+                    if leader:
+                        self.breaker.cancel_probe()
+                    raise
+            if finished:
+                break
+        if flight.error is not None:
+            if leader:
+                self.breaker.record_failure()
+            self._count(metrics, "errors", time.time() - started)
+            raise flight.error
+        if leader:
+            self.breaker.record_success()
+        self._count(metrics, "successes", time.time() - started)
+
+    def stream_text(self, site, contents, timeout=None, **kwargs):
+        """
+        Generator over the text chunks of a streaming generate_content(contents).
+        Raises an LLMError / upstream exception, possibly after some chunks.
+        """
+        metrics = self._site(site)
+        self._count(metrics, "calls")
+        timeout = timeout or self.timeouts.get(site, self.default_timeout)
+
+        key = flight_key(site, contents, dict(kwargs, stream=True)) if self.single_flight else None
+        if key is not None:
+            flight, leader = self._join_flight(key, timeout, StreamFlight)
+            if not leader:
+                self._count(metrics, "coalesced")
+                yield from self._replay(site, metrics, flight, timeout)
+                return
+        else:
+            flight = StreamFlight()
+
+        if not self.breaker.allow():
+            self._count(metrics, "short_circuited")
+            error = CircuitOpenError(f"LLM circuit open, skipping {site}")
+            self._drop_flight(key, flight)
+            flight.finish(error)
+            raise error
+
+        if not self._slots.acquire(timeout=timeout):
+            self.breaker.cancel_probe()
+            self._count(metrics, "rejected")
+            error = LLMBusyError(f"No free LLM slot for {site} within {timeout}s")
+            self._drop_flight(key, flight)
+            flight.finish(error)
+            raise error
+
+        self._pool.submit(self._pump, key, contents, kwargs, flight, timeout)
+        yield from self._replay(site, metrics, flight, timeout, key=key, leader=True)
+
+    def stats(self):
+        with self._lock:
+            sites = {site: m.snapshot() for site, m in self._metrics.items()}
+        return {
+            "circuit": self.breaker.stats(),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "coalescing": len(self._flights),
+            "sites": sites
+        }
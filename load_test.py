@@ -0,0 +1,243 @@
+import io
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.cookiejar import CookieJar
+from urllib import request as urlrequest
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+
+# Load test for the AI-backed routes
+# Each virtual user runs scripted diagnostic sessions:
+#   extract_symptoms -> predict (answering the refinement questions) ->
+#   explain_disease -> generate_report, plus analyze_image every N sessions.
+# Hindi/Gujarati scripts also exercise translate_info on the final result.
+# Reports throughput and p50/p95/p99 latency per route.
+#
+#   python load_test.py                                  -> in-process app, local stand-in LLM
+#   python load_test.py --users 16 --sessions 20 --latency lognormal:400:0.6 --error-rate 0.05
+#   python load_test.py --url http://127.0.0.1:5000 --username doc --password secret
+#
+# In-process runs set LLM_BACKEND before importing flask_app (standin by
+# default, or http with --standin-url); against --url the server's own
+# LLM_BACKEND applies (start it with standin_server.py to avoid Gemini).
+# In-process runs never touch a real database: MONGO_URI is cleared (CSV
+# fallback, nothing saved) unless --mongo-uri names a throwaway one.
+
+SCRIPTS = [
+    ("en-IN", "English", "I have fever and headache since two days"),
+    ("en-IN", "English", "feeling dizzy with stomach pain and nausea"),
+    ("en-IN", "English", "mujhe bukhar hai aur sar dard"),
+    ("hi-IN", "Hindi", "मुझे बुखार और खांसी है"),
+    ("gu-IN", "Gujarati", "મને તાવ અને માથું દુખે છે"),
+]
+FALLBACK_SYMPTOMS = ["fever", "headache"]
+
+
+class InProcessTransport:
+    """Flask test client logged in as a load-test user (no server, no database login)."""
+
+    def __init__(self, app, username):
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess["user"] = {"username": username, "role": "doctor"}
+
+    def post_json(self, path, payload):
+        resp = self.client.post(path, json=payload)
+        return resp.status_code, resp.get_json(silent=True)
+
+    def post_image(self, path, field, data, filename):
+        resp = self.client.post(path, data={field: (io.BytesIO(data), filename)}, content_type="multipart/form-data")
+        return resp.status_code, resp.get_json(silent=True)
+
+
+class HTTPTransport:
+    """Cookie-keeping urllib client against a running server."""
+
+    def __init__(self, base_url, username, password):
+        self.base_url = base_url.rstrip("/")
+        self.opener = urlrequest.build_opener(urlrequest.HTTPCookieProcessor(CookieJar()))
+        body = urlencode({"username": username, "password": password}).encode("utf-8")
+        self.opener.open(f"{self.base_url}/login", data=body, timeout=30).read()
+
+    def _send(self, path, body, content_type):
+        req = urlrequest.Request(f"{self.base_url}{path}", data=body, headers={"Content-Type": content_type})
+        try:
+            with self.opener.open(req, timeout=120) as resp:
+                status, raw, kind = resp.status, resp.read(), resp.headers.get("Content-Type", "")
+        except HTTPError as e:
+            status, raw, kind = e.code, e.read(), e.headers.get("Content-Type", "")
+        return status, json.loads(raw) if kind.startswith("application/json") else None
+
+    def post_json(self, path, payload):
+        return self._send(path, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def post_image(self, path, field, data, filename):
+        boundary = uuid.uuid4().hex
+        body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+                f"Content-Type: image/png\r\n\r\n").encode("utf-8") + data + f"\r\n--{boundary}--\r\n".encode("utf-8")
+        return self._send(path, body, f"multipart/form-data; boundary={boundary}")
+
+
+def sample_image():
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (200, 200, 200)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {} # route -> [(seconds, ok)]
+        self.sessions = 0
+        self._lock = threading.Lock()
+
+    def timed(self, route, call):
+        started = time.perf_counter()
+        try:
+            status, body = call()
+            ok = status < 400
+        except Exception as e:
+            print(f"{route}: {e}")
+            status, body, ok = None, None, False
+        with self._lock:
+            self.samples.setdefault(route, []).append((time.perf_counter() - started, ok))
+        return status, body
+
+    def session_done(self):
+        with self._lock:
+            self.sessions += 1
+
+
+def run_session(transport, recorder, rng, max_questions, yes_rate, image=None):
+    language_code, language, text = rng.choice(SCRIPTS)
+
+    _, body = recorder.timed("/api/extract_symptoms", lambda: transport.post_json(
+        "/api/extract_symptoms", {"text": text, "language": language_code}))
+    symptoms = (body or {}).get("symptoms") or FALLBACK_SYMPTOMS
+
+    _, body = recorder.timed("/api/predict", lambda: transport.post_json(
+        "/api/predict", {"session": True, "symptoms": symptoms, "language": language_code}))
+    asked = 0
+    while body and body.get("status") == "question":
+        payload = {"session_id": body.get("session_id"), "language": language_code}
+        if asked < max_questions:
+            payload["answer"] = {"symptom": body["question_symptom"], "value": rng.random() < yes_rate}
+        else:
+            payload["force_final"] = True
+        asked += 1
+        _, body = recorder.timed("/api/predict", lambda: transport.post_json("/api/predict", payload))
+
+    disease = ((body or {}).get("result") or {}).get("disease")
+    if disease:
+        recorder.timed("/api/explain_disease", lambda: transport.post_json(
+            "/api/explain_disease", {"disease": disease, "language": language}))
+        recorder.timed("/api/generate_report", lambda: transport.post_json(
+            "/api/generate_report", {"disease": disease, "language": language}))
+    if image is not None:
+        recorder.timed("/api/analyze_image", lambda: transport.post_image(
+            "/api/analyze_image", "image", image, "scan.png"))
+    recorder.session_done()
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000 if ordered else 0.0
+
+
+def report(recorder, elapsed):
+    total = sum(len(v) for v in recorder.samples.values())
+    print(f"\n{recorder.sessions} sessions, {total} requests in {elapsed:.1f}s: "
+          f"{recorder.sessions / elapsed:.2f} sessions/s, {total / elapsed:.1f} requests/s")
+    print(f"{'route':<26}{'count':>7}{'errors':>8}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    summary = {}
+    for route in sorted(recorder.samples):
+        samples = recorder.samples[route]
+        ordered = sorted(s for s, _ in samples)
+        errors = sum(1 for _, ok in samples if not ok)
+        row = {"count": len(samples), "errors": errors, "rps": round(len(samples) / elapsed, 2),
+               "p50_ms": round(percentile(ordered, 0.50), 1), "p95_ms": round(percentile(ordered, 0.95), 1),
+               "p99_ms": round(percentile(ordered, 0.99), 1)}
+        summary[route] = row
+        print(f"{route:<26}{row['count']:>7}{row['errors']:>8}{row['rps']:>8}"
+              f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}")
+    return {"sessions": recorder.sessions, "requests": total, "seconds": round(elapsed, 2), "routes": summary}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive scripted diagnostic sessions and report per-route latency.")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent virtual users")
+    parser.add_argument("--sessions", type=int, default=10, help="Sessions per user")
+    parser.add_argument("--max-questions", type=int, default=3, help="Refinement answers before forcing a result")
+    parser.add_argument("--yes-rate", type=float, default=0.3)
+    parser.add_argument("--image-every", type=int, default=5, help="analyze_image every N sessions (0 = never)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="Running server; default is an in-process app")
+    parser.add_argument("--username", default="loadtest")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--backend", choices=("standin", "http", "gemini"), default="standin",
+                        help="LLM backend for the in-process app")
+    parser.add_argument("--standin-url", default="http://127.0.0.1:8765")
+    parser.add_argument("--latency", default="lognormal:300:0.5", help="In-process stand-in latency spec")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument("--mongo-uri", default="", help="Throwaway MongoDB for the in-process app (default: none)")
+    parser.add_argument("--json", help="Also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    app = None
+    if args.url is None:
+        os.environ["LLM_BACKEND"] = args.backend
+        os.environ["LLM_STANDIN_URL"] = args.standin_url
+        os.environ["LLM_STANDIN_LATENCY"] = args.latency
+        os.environ["LLM_STANDIN_ERROR_RATE"] = str(args.error_rate)
+        os.environ["LLM_STANDIN_TIMEOUT_RATE"] = str(args.timeout_rate)
+        os.environ["LLM_STANDIN_HANG_SECONDS"] = str(args.hang_seconds)
+        os.environ["LLM_STANDIN_SEED"] = str(args.seed)
+        os.environ["MONGO_URI"] = args.mongo_uri
+        import flask_app
+        app = flask_app
+        if not args.mongo_uri and app.USING_MONGODB:
+            sys.exit("flask_app connected to a database without --mongo-uri; refusing to write load-test history")
+
+    image = sample_image() if args.image_every > 0 else None
+    recorder = Recorder()
+
+    def user(n):
+        rng = random.Random(args.seed * 1000 + n)
+        if app is not None:
+            transport = InProcessTransport(app.app, f"{args.username}{n}")
+        else:
+            transport = HTTPTransport(args.url, args.username, args.password)
+        for i in range(args.sessions):
+            with_image = image if args.image_every and (n * args.sessions + i) % args.image_every == 0 else None
+            run_session(transport, recorder, rng, args.max_questions, args.yes_rate, with_image)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(n,)) for n in range(args.users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    summary = report(recorder, time.perf_counter() - started)
+
+    if app is not None:
+        summary["llm"] = app.llm.stats()
+        circuit = summary["llm"]["circuit"]
+        print(f"\nLLM gateway: circuit {circuit['state']} (opened {circuit['opens']}x)")
+        for site, m in sorted(summary["llm"]["sites"].items()):
+            print(f"  {site:<24} calls {m['calls']:>5}  ok {m['successes']:>5}  errors {m['errors']:>4}  "
+                  f"timeouts {m['timeouts']:>4}  short-circuited {m['short_circuited']:>4}  p95 {m['latency_ms']['p95']} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import os
+import sys
+import multiprocessing as mp
+
+# Memory comparison: N worker processes each loading their own copy of the
+# model arrays ("private") vs. memory-mapping one published copy ("shared").
+# Reports summed PSS (proportional set size: shared pages are split between
+# the processes mapping them), which is what the box actually pays.
+# Linux only (/proc/<pid>/smaps_rollup).
+#
+#   python measure_worker_memory.py            -> 1, 4 and 8 workers
+#   python measure_worker_memory.py 2 16       -> custom worker counts
+
+from shared_store import attach_or_publish
+from symptom_profiles import ensure_profile_artifact, PROFILE_PATH
+from tree_engine import COMPILED_MODEL_PATH
+
+SHARED_DIR = os.path.join("data", "shared")
+
+
+def read_memory(pid):
+    """kB values from smaps_rollup (Rss, Pss, Private_*)."""
+    stats = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == "kB":
+                stats[parts[0].rstrip(":")] = int(parts[1])
+    return stats
+
+
+def worker(mode, ready, stop):
+    import numpy as np
+    from tree_engine import CompiledForest
+    from symptom_profiles import SymptomProfiles
+
+    if mode == "shared":
+        forest = CompiledForest(attach_or_publish("forest", COMPILED_MODEL_PATH, SHARED_DIR))
+        profiles = attach_or_publish("profiles", PROFILE_PATH, SHARED_DIR)
+    else:
+        forest = CompiledForest.load()
+        profiles = SymptomProfiles.load().__dict__
+
+    # Touch every page, as a worker serving traffic eventually would
+    for arr in list(vars(forest).values()) + list(profiles.values()):
+        if isinstance(arr, np.ndarray) and arr.dtype.kind in "iuf":
+            arr.sum()
+    forest.predict_proba(np.zeros(forest.n_features_in_, dtype=np.float32))
+
+    ready.put(os.getpid())
+    stop.wait()
+
+
+def measure(mode, n_workers):
+    ctx = mp.get_context("spawn")
+    ready, stop = ctx.Queue(), ctx.Event()
+    procs = [ctx.Process(target=worker, args=(mode, ready, stop)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    pids = [ready.get(timeout=300) for _ in procs]
+    totals = {"Rss": 0, "Pss": 0, "Private": 0}
+    for pid in pids:
+        m = read_memory(pid)
+        totals["Rss"] += m.get("Rss", 0)
+        totals["Pss"] += m.get("Pss", 0)
+        totals["Private"] += m.get("Private_Clean", 0) + m.get("Private_Dirty", 0)
+    stop.set()
+    for p in procs:
+        p.join()
+    return totals
+
+
+def main(counts):
+    if not sys.platform.startswith("linux"):
+        print("This measurement needs Linux (/proc/<pid>/smaps_rollup).")
+        return
+    ensure_profile_artifact()
+    # Publish once up front so the timing of the first worker does not matter
+    attach_or_publish("forest", COMPILED_MODEL_PATH, SHARED_DIR)
+    attach_or_publish("profiles", PROFILE_PATH, SHARED_DIR)
+
+    print(f"Model artifact: {COMPILED_MODEL_PATH} ({os.path.getsize(COMPILED_MODEL_PATH) / 1e6:.1f} MB)")
+    print(f"{'workers':>7} | {'mode':>7} | {'sum RSS MB':>10} | {'sum PSS MB':>10} | {'private MB':>10}")
+    for n in counts:
+        for mode in ("private", "shared"):
+            t = measure(mode, n)
+            print(f"{n:>7} | {mode:>7} | {t['Rss'] / 1024:>10.1f} | {t['Pss'] / 1024:>10.1f} | {t['Private'] / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1, 4, 8])
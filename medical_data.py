@@ -2,6 +2,8 @@
 # Medical Metadata Database
 # Contains: Type, Severity, Emergency Status, Treatment Mode, and Approx Cost (INR)
 
+from disease_resolver import DiseaseNameResolver
+
 medical_db = {
     "common cold": {
         "type": "Viral Infection",
@@ -278,6 +280,15 @@ medical_db = {
     }
 }
 
+_resolver = None
+
+def match_medical_entry(disease_name):
+    """(medical_db key, confidence) for a predicted label, or (None, 0.0)."""
+    global _resolver
+    if _resolver is None:
+        _resolver = DiseaseNameResolver([k for k in medical_db if k != "default"])
+    return _resolver.resolve(disease_name)
+
 def get_medical_info(disease_name):
     # Normalize key
     key = disease_name.lower().strip()
@@ -285,6 +296,8 @@ def get_medical_info(disease_name):
     if key in medical_db:
         return medical_db[key]
     
-    # Try partial match (e.g., "acute pancreatitis" -> find "pancreatitis" if it existed, or reverse)
-    # Simple fallback for now
+    # Fuzzy match (e.g. "Alcoholic hepatitis" -> "hepatitis", misspellings)
+    match, _ = match_medical_entry(disease_name)
+    if match is not None:
+        return medical_db[match]
     return medical_db["default"]
@@ -0,0 +1,113 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+import numpy as np
+
+# Micro-batching in front of the model
+# Request threads enqueue one input row and wait on a Future. A single
+# dispatcher thread flushes the queue every max_wait_ms (or as soon as
+# max_batch_size rows are waiting), runs ONE batched predict_proba and hands
+# each caller its own row back.
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+DEFAULT_TIMEOUT = 10.0 # Seconds a caller waits for its row before giving up
+
+
+class MicroBatcher:
+    def __init__(self, predict_fn, max_wait_ms=2.0, max_batch_size=32):
+        self.predict_fn = predict_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        # Metrics
+        self.batches = 0
+        self.rows = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+        self.batch_size_hist = {b: 0 for b in BATCH_SIZE_BUCKETS}
+        self.batch_size_hist["+Inf"] = 0
+        self.queue_depth_hist = {b: 0 for b in BATCH_SIZE_BUCKETS}
+        self.queue_depth_hist["+Inf"] = 0
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                    self._thread.start()
+
+    def submit(self, vector):
+        """Queues one input row; the Future resolves to that row's probabilities."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((np.asarray(vector, dtype=np.float32), future))
+        depth = self._queue.qsize()
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+            _observe(self.queue_depth_hist, depth)
+        return future
+
+    def predict_one(self, vector, timeout=DEFAULT_TIMEOUT):
+        return self.submit(vector).result(timeout=timeout)
+
+    def _collect(self):
+        """Blocks for the first row, then gathers more until the batch is full or the wait expires."""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                # A malformed row (wrong length) fails its whole batch, never the dispatcher
+                probs = self.predict_fn(np.stack([v for v, _ in batch]))
+                for i, (_, future) in enumerate(batch):
+                    if not future.done():
+                        future.set_result(probs[i])
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            with self._lock:
+                self.batches += 1
+                self.rows += len(batch)
+                _observe(self.batch_size_hist, len(batch))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_wait_ms": self.max_wait * 1000.0,
+                "max_batch_size": self.max_batch_size,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "batches": self.batches,
+                "rows": self.rows,
+                "errors": self.errors,
+                "avg_batch_size": round(self.rows / self.batches, 2) if self.batches else 0.0,
+                "batch_size_histogram": {str(k): v for k, v in self.batch_size_hist.items()},
+                "queue_depth_histogram": {str(k): v for k, v in self.queue_depth_hist.items()}
+            }
+
+
+def _observe(hist, value):
+    """Counts value in the first bucket whose upper bound is >= value."""
+    for bound in BATCH_SIZE_BUCKETS:
+        if value <= bound:
+            hist[bound] += 1
+            return
+    hist["+Inf"] += 1
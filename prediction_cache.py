@@ -0,0 +1,104 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Prediction cache for /api/predict
+# Keyed by the canonical symptom set + force_final + model version. The model
+# version is the stat signature of the model files, so replacing
+# disease_model.pkl / label_encoder.pkl (or the compiled artifact) on disk
+# drops every cached entry automatically.
+
+MODEL_FILES = ("disease_model.pkl", "label_encoder.pkl", "disease_model_compiled.npz")
+
+
+def model_version(paths=MODEL_FILES):
+    """Cheap fingerprint of the model files on disk (mtime + size, no hashing)."""
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{os.path.basename(path)}:{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append(f"{os.path.basename(path)}:missing")
+    return "|".join(parts)
+
+
+class PredictionCache:
+    def __init__(self, max_entries=1024, paths=MODEL_FILES):
+        self.max_entries = max_entries
+        self.paths = paths
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.version = model_version(paths)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def canonical(symptoms):
+        return tuple(sorted(frozenset(symptoms)))
+
+    def changed_version(self):
+        """Fingerprint of the model files if they differ from the cached version, else None."""
+        current = model_version(self.paths)
+        return None if current == self.version else current
+
+    def advance(self, version):
+        """
+        Moves the cache to version (clearing it). Call only once the model
+        loaded from those files is serving; returns False if already there.
+        """
+        with self._lock:
+            if version == self.version:
+                return False
+            self._entries.clear()
+            self.version = version
+            self.invalidations += 1
+            return True
+
+    def get(self, symptoms, force_final, version):
+        """Entry for symptoms computed by the model at version, or None."""
+        key = (self.canonical(symptoms), bool(force_final), version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, symptoms, force_final, entry, version):
+        """
+        Stores a result under the version that was current when the request
+        read it; results of a model that has since been replaced are dropped.
+        """
+        key = (self.canonical(symptoms), bool(force_final), version)
+        with self._lock:
+            if version != self.version:
+                return False
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "model_version": self.version
+            }
@@ -0,0 +1,227 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import datetime
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from disease_knowledge import load_knowledge_index, normalize_name, SOURCES
+from translation_cache import content_hash
+from report_headers import REPORT_HEADERS
+from llm_backends import StandInLLM, HTTPStandInLLM, gemini_model
+
+# Offline pre-translation of the disease knowledge base
+# Walks every disease in description.csv and medications.csv, translates its
+# merged info (get_detailed_info) into each non-English language of
+# REPORT_HEADERS and writes a versioned bundle that flask_app loads at startup,
+# so final results in Hindi/Gujarati never wait on the LLM.
+#
+#   python pretranslate.py                         -> Gemini (GEMINI_API_KEY)
+#   python pretranslate.py --backend local         -> deterministic local stand-in
+#   python pretranslate.py --workers 8 --fresh     -> ignore the checkpoint
+#
+# Every finished translation is appended to a checkpoint file, so an
+# interrupted or partially failed run resumes where it stopped.
+
+BUNDLE_PATH = os.path.join("data", "translation_bundle.json")
+CHECKPOINT_PATH = os.path.join("data", "translation_bundle.checkpoint.jsonl")
+BUNDLE_FORMAT = 1
+
+
+def translation_prompt(info, language):
+    """Prompt shared with flask_app.translate_info so both produce the same payloads."""
+    return (
+        f"Translate the following medical information into simple {language}. "
+        "Maintain the JSON structure. Translate the values, not the keys. "
+        f"Target Language: {language}\n"
+        f"Data: {json.dumps(info)}"
+    )
+
+
+def parse_translation(text):
+    text = text.strip()
+    if "```" in text:
+        text = text.replace("```json", "").replace("```", "")
+    return json.loads(text)
+
+
+def knowledge_base_diseases():
+    """Display names of every disease in description.csv and medications.csv (deduplicated)."""
+    names = {}
+    for field in ("description", "medications"):
+        for name in pd.read_csv(SOURCES[field][0])['Disease'].dropna():
+            names.setdefault(normalize_name(name), str(name).strip())
+    return names
+
+
+def target_languages():
+    return [lang for lang in REPORT_HEADERS if lang != "English"]
+
+
+def read_checkpoint(path):
+    """(language, disease key, content hash) -> translated info from earlier runs."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                done[(entry["language"], entry["disease"], entry["content_hash"])] = entry["info"]
+            except (ValueError, KeyError):
+                continue # Torn last line from an interrupted run
+    return done
+
+
+def bundle_version(entries):
+    digest = hashlib.sha256()
+    for language in sorted(entries):
+        for key in sorted(entries[language]):
+            digest.update(f"{language}|{key}|{entries[language][key]['content_hash']}\n".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def write_bundle(entries, path, backend):
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "version": bundle_version(entries),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "backend": backend,
+        "languages": sorted(entries),
+        "entries": entries
+    }
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, ensure_ascii=False)
+    os.replace(tmp, path) # Workers never see a half-written bundle
+    return bundle["version"]
+
+
+def run(llm, backend="gemini", workers=4, bundle_path=BUNDLE_PATH, checkpoint_path=CHECKPOINT_PATH, fresh=False):
+    knowledge = load_knowledge_index()
+    diseases = knowledge_base_diseases()
+    languages = target_languages()
+    if fresh and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    done = read_checkpoint(checkpoint_path)
+
+    jobs = []
+    entries = {language: {} for language in languages}
+    for key, name in sorted(diseases.items()):
+        info = knowledge.get(name)
+        digest = content_hash(info)
+        for language in languages:
+            cached = done.get((language, key, digest))
+            if cached is not None:
+                entries[language][key] = {"content_hash": digest, "info": cached}
+            else:
+                jobs.append((language, key, name, info, digest))
+
+    total = len(diseases) * len(languages)
+    print(f"{len(diseases)} diseases x {len(languages)} languages ({', '.join(languages)}): "
+          f"{total - len(jobs)} from checkpoint, {len(jobs)} to translate with {workers} workers")
+
+    failures = []
+
+    def translate(job):
+        language, key, name, info, digest = job
+        translated = parse_translation(llm.generate_content(translation_prompt(info, language)).text)
+        if not isinstance(translated, dict):
+            raise ValueError("translation is not a JSON object")
+        return translated
+
+    started = time.time()
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(translate, job): job for job in jobs}
+        for n, future in enumerate(as_completed(futures), 1):
+            language, key, name, info, digest = futures[future]
+            try:
+                translated = future.result()
+            except Exception as e:
+                failures.append((language, name, str(e)))
+                continue
+            entries[language][key] = {"content_hash": digest, "info": translated}
+            checkpoint.write(json.dumps({"language": language, "disease": key, "content_hash": digest,
+                                         "info": translated}, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+            if n % 50 == 0:
+                print(f"  {n}/{len(jobs)} done ({time.time() - started:.1f}s)")
+
+    version = write_bundle(entries, bundle_path, backend)
+    translated = sum(len(v) for v in entries.values())
+    print(f"Bundle {version}: {translated}/{total} translations -> {bundle_path} ({time.time() - started:.1f}s)")
+    if failures:
+        print(f"{len(failures)} translation(s) failed; rerun to retry them (finished ones are checkpointed):")
+        for language, name, error in failures[:10]:
+            print(f"  {language} / {name}: {error}")
+    return version, failures
+
+
+class TranslationBundle:
+    """Pre-translated disease info: (disease, language, source content) -> translated dict."""
+
+    def __init__(self, bundle):
+        self.version = bundle["version"]
+        self.languages = bundle["languages"]
+        self.entries = bundle["entries"]
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, disease, language, info):
+        entry = self.entries.get(language, {}).get(normalize_name(disease))
+        # Only valid for the exact source payload it was translated from
+        if entry is None or entry["content_hash"] != content_hash(info):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["info"]
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "languages": self.languages,
+            "entries": sum(len(v) for v in self.entries.values()),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def load_bundle(path=BUNDLE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        bundle = json.load(f)
+    if bundle.get("format") != BUNDLE_FORMAT:
+        print(f"Ignoring translation bundle with unknown format {bundle.get('format')}")
+        return None
+    return TranslationBundle(bundle)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-translate the disease knowledge base.")
+    parser.add_argument("--backend", choices=("gemini", "local", "http"), default="gemini",
+                        help="local: in-process stand-in, http: standin_server.py at --standin-url")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent LLM calls")
+    parser.add_argument("--fresh", action="store_true", help="Discard the checkpoint and translate everything")
+    parser.add_argument("--bundle", default=BUNDLE_PATH)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--standin-latency-ms", type=float, default=50.0)
+    parser.add_argument("--standin-fail-rate", type=float, default=0.0)
+    parser.add_argument("--standin-url", default="http://127.0.0.1:8765")
+    args = parser.parse_args(argv)
+
+    if args.backend == "local":
+        llm = StandInLLM(latency=f"fixed:{args.standin_latency_ms}", error_rate=args.standin_fail_rate)
+    elif args.backend == "http":
+        llm = HTTPStandInLLM(args.standin_url)
+    else:
+        llm = gemini_model()
+    _, failures = run(llm, args.backend, max(1, args.workers), args.bundle, args.checkpoint, args.fresh)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+# Localized section headings for the PDF report
+# The keys are also the languages the knowledge base is pre-translated into (pretranslate.py).
+
+REPORT_HEADERS = {
+    "English": {
+        "title": "MEDICAL SCREENING REPORT",
+        "meds": "RECOMMENDED MEDICATIONS & TREATMENT:",
+        "prec": "GENERAL PRECAUTIONS:",
+        "diet": "DIET PLAN:",
+        "work": "LIFESTYLE & EXERCISE:",
+        "disclaimer": "Disclaimer: This is an AI-generated screening report. It is not an official medical diagnosis. Please consult a qualified doctor for clinical verification."
+    },
+    "Hindi": {
+        "title": "मेडिकल स्क्रीनिंग रिपोर्ट",
+        "meds": "अनुशंसित दवाएं और उपचार:",
+        "prec": "सामान्य सावधानियां:",
+        "diet": "आहार योजना:",
+        "work": "जीवनशैली और व्यायाम:",
+        "disclaimer": "अस्वीकरण: यह एक एआई-जेनरेटेड रिपोर्ट है। यह आधिकारिक चिकित्सा निदान नहीं है। नैदानिक सत्यापन के लिए कृपया डॉक्टर से परामर्श लें।"
+    },
+    "Gujarati": {
+        "title": "મેડિકલ સ્ક્રિનિંગ રિપોર્ટ",
+        "meds": "ભલામણ કરેલ દવાઓ અને સારવાર:",
+        "prec": "સામાન્ય સાવચેતીઓ:",
+        "diet": "આહાર યોજના:",
+        "work": "જીવનશૈલી અને કસરત:",
+        "disclaimer": "ડિસ્ક્લેમર: આ એક AI-જનરેટેડ રિપોર્ટ છે. તે સત્તાવાર તબીબી નિદાન નથી. કૃપા કરીને ડોક્ટરની સલાહ લો."
+    }
+}
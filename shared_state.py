@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# Small cross-worker key/value store
+# gunicorn runs several worker processes without sticky routing, so per-request
+# state that a later request must find (diagnosis sessions, streamed report
+# text, explanations) cannot live in one process's memory. SharedState keeps
+# JSON values in one SQLite file (WAL mode, like translation_cache.py), one
+# table per namespace, with an expiry and an LRU cap on the row count.
+
+SHARED_STATE_PATH = os.path.join("data", "shared_state.sqlite3")
+
+
+class SharedState:
+    def __init__(self, namespace, path=SHARED_STATE_PATH, ttl_seconds=None, max_entries=None, trim_every=100):
+        if not namespace.isidentifier():
+            raise ValueError(f"Bad namespace '{namespace}'")
+        self.table = f"kv_{namespace}"
+        self.path = path
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.trim_every = trim_every
+        self._local = threading.local() # sqlite3 connections are per thread
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.errors = 0
+        with self._connect() as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_updated ON {self.table} (updated)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL") # Readers never block the writer across workers
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _error(self, e):
+        print(f"Shared State Error ({self.table}): {e}")
+        with self._lock:
+            self.errors += 1
+
+    def get(self, key, max_age=None):
+        """(value, age seconds) or None if missing, expired or older than max_age."""
+        try:
+            row = self._connect().execute(f"SELECT value, updated FROM {self.table} WHERE key=?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            self._error(e)
+            return None
+        if row is None:
+            return None
+        age = time.time() - row[1]
+        limits = [a for a in (self.ttl, max_age) if a is not None]
+        if limits and age > min(limits):
+            return None
+        return json.loads(row[0]), age
+
+    def put(self, key, value):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?)",
+                             (key, json.dumps(value, ensure_ascii=False), time.time()))
+            with self._lock:
+                self._writes += 1
+                trim = self._writes % self.trim_every == 0
+            if trim:
+                self.trim()
+            return True
+        except sqlite3.Error as e:
+            self._error(e)
+            return False
+
+    def delete(self, key):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(f"DELETE FROM {self.table} WHERE key=?", (key,))
+        except sqlite3.Error as e:
+            self._error(e)
+
+    def trim(self):
+        """Drops expired rows, then the least recently written ones past max_entries. Returns rows removed."""
+        removed = 0
+        try:
+            conn = self._connect()
+            with conn:
+                if self.ttl is not None:
+                    removed += conn.execute(f"DELETE FROM {self.table} WHERE updated < ?", (time.time() - self.ttl,)).rowcount
+                if self.max_entries is not None:
+                    removed += conn.execute(
+                        f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} "
+                        f"ORDER BY updated DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+                    ).rowcount
+        except sqlite3.Error as e:
+            self._error(e)
+        return removed
+
+    def __len__(self):
+        try:
+            return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        except sqlite3.Error as e:
+            self._error(e)
+            return 0
@@ -0,0 +1,70 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+
+# Read-only arrays shared by every WSGI worker
+# Each artifact (compiled forest, profile matrix) is published once as plain
+# .npy files under SHARED_ARRAYS_DIR/<name>-<fingerprint>/ and workers open
+# them with np.load(mmap_mode='r'). The OS page cache then holds ONE copy of
+# the bytes no matter how many worker processes map them.
+
+DEFAULT_SHARED_DIR = os.path.join("data", "shared")
+MANIFEST = "manifest.json"
+
+
+def source_fingerprint(path):
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def read_npz(path):
+    with np.load(path, allow_pickle=False) as npz:
+        return {k: npz[k] for k in npz.files}
+
+
+def publish_arrays(target, arrays):
+    """Writes arrays as .npy files into target atomically (temp dir + rename)."""
+    tmp = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for key, arr in arrays.items():
+        np.save(os.path.join(tmp, f"{key}.npy"), np.asarray(arr), allow_pickle=False)
+    with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"arrays": sorted(arrays)}, f)
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        # Another process published the same version first; use theirs
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def attach_arrays(target):
+    """Read-only memory maps of a published artifact."""
+    with open(os.path.join(target, MANIFEST), "r", encoding="utf-8") as f:
+        keys = json.load(f)["arrays"]
+    return {k: np.load(os.path.join(target, f"{k}.npy"), mmap_mode="r", allow_pickle=False) for k in keys}
+
+
+def attach_or_publish(name, source_path, shared_dir=DEFAULT_SHARED_DIR, loader=read_npz):
+    """
+    Attaches to the published copy of source_path, publishing it first if this
+    version has not been published yet. Older versions are left for cleanup.
+    """
+    target = os.path.join(shared_dir, f"{name}-{source_fingerprint(source_path)}")
+    if not os.path.exists(os.path.join(target, MANIFEST)):
+        os.makedirs(shared_dir, exist_ok=True)
+        publish_arrays(target, loader(source_path))
+    return attach_arrays(target)
+
+
+def remove_stale_versions(name, source_path, shared_dir=DEFAULT_SHARED_DIR):
+    """Deletes published versions of name other than the current one."""
+    if not os.path.isdir(shared_dir):
+        return
+    current = f"{name}-{source_fingerprint(source_path)}"
+    for entry in os.listdir(shared_dir):
+        if entry.startswith(f"{name}-") and entry != current and ".tmp-" not in entry:
+            shutil.rmtree(os.path.join(shared_dir, entry), ignore_errors=True)
@@ -0,0 +1,99 @@
+import sys
+import json
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from llm_backends import StandInLLM, STANDIN_URL
+
+# HTTP front for the Gemini stand-in (llm_backends.StandInLLM)
+# Run it next to the app and point the app at it:
+#
+#   python standin_server.py --latency lognormal:400:0.6 --error-rate 0.02
+#   LLM_BACKEND=http LLM_STANDIN_URL=http://127.0.0.1:8765 python flask_app.py
+#
+# POST /generate {"prompt", "image", "stream"} -> {"text"}, or for stream=true
+# one {"text"} JSON line per chunk ({"error"} if the call fails mid-stream).
+# Injected errors answer 503, injected hangs 504 after --hang-seconds.
+# GET /stats -> call/error/hang counters.
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    model = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.model.stats())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            return self._send_json(404, {"error": "not found"})
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        contents = request.get("prompt", "")
+        if request.get("image"):
+            contents = [contents, b"image"] # Any non-text part marks an image call
+        try:
+            if not request.get("stream"):
+                return self._send_json(200, {"text": self.model.generate_content(contents).text})
+            chunks = iter(self.model.generate_content(contents, stream=True))
+            first = next(chunks, None) # Errors before the first chunk still get a status code
+        except TimeoutError as e:
+            return self._send_json(504, {"error": str(e)})
+        except Exception as e:
+            return self._send_json(503, {"error": str(e)})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            if first is not None:
+                self._write_line({"text": first.text})
+            for chunk in chunks:
+                self._write_line({"text": chunk.text})
+        except Exception as e:
+            self._write_line({"error": str(e)})
+
+    def _write_line(self, payload):
+        self.wfile.write((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass # One line per call would drown the load test output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the deterministic Gemini stand-in over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(STANDIN_URL.rsplit(":", 1)[1]))
+    parser.add_argument("--latency", default="lognormal:300:0.5",
+                        help="fixed:MS | uniform:LOW:HIGH | normal:MEAN:SD | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Share of calls that hang")
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    StandInHandler.model = StandInLLM(args.latency, args.error_rate, args.timeout_rate, args.hang_seconds, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), StandInHandler)
+    server.daemon_threads = True
+    print(f"Gemini stand-in on http://{args.host}:{args.port} (latency {args.latency}, "
+          f"errors {args.error_rate:.0%}, hangs {args.timeout_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
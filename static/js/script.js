@@ -1,6 +1,10 @@
 // State
 let selectedSymptoms = [];
 let askedSymptoms = [];
+let diagSessionId = null; // Server-side diagnosis session (only answers are sent per turn)
+let questionNode = null; // Current node of the server's question_tree (answered locally)
+let pendingAnswers = []; // Answers collected while walking the tree, sent in one request
+const LOOKAHEAD_DEPTH = 2;
 let currentVoiceText = "";
 let currentLang = 'en';
 let reportLang = 'English';
@@ -173,6 +177,38 @@ async function apiFetch(url, options = {}) {
     }
 }
 
+// Server-Sent Events over a POST: calls onEvent for each "data: {...}" frame
+async function streamSSE(url, body, onEvent) {
+    const res = await apiFetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+    if (!res) return false;
+    if (!res.ok) throw new Error("Server error");
+    if (!(res.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+        const data = await res.json();
+        throw new Error(data.error || "Unexpected response");
+    }
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let end;
+        while ((end = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            const line = frame.split('\n').find(l => l.startsWith('data:'));
+            if (line) onEvent(JSON.parse(line.slice(5)));
+        }
+    }
+    return true;
+}
+
 // --- TABS ---
 function switchTab(tabId) {
     // Hide all tabs
@@ -262,6 +298,9 @@ function addSymptom(symptom) {
     if (selectedSymptoms.includes(symptom)) return;
 
     selectedSymptoms.push(symptom);
+    diagSessionId = null; // Symptom set changed outside the question loop
+    questionNode = null;
+    pendingAnswers = [];
     renderChips();
     searchInput.value = '';
     suggestionsList.classList.add('hidden');
@@ -269,12 +308,18 @@ function addSymptom(symptom) {
 
 function removeSymptom(symptom) {
     selectedSymptoms = selectedSymptoms.filter(s => s !== symptom);
+    diagSessionId = null;
+    questionNode = null;
+    pendingAnswers = [];
     renderChips();
 }
 
 function clearSymptoms() {
     selectedSymptoms = [];
     askedSymptoms = [];
+    diagSessionId = null;
+    questionNode = null;
+    pendingAnswers = [];
     renderChips();
     document.getElementById('interaction-area').classList.add('hidden');
     document.getElementById('interaction-area').innerHTML = "";
@@ -386,20 +431,29 @@ async function startDiagnosis(forceFinal = false) {
 
     try {
         const voiceLang = document.getElementById('voice-lang').value;
+        // With a live session only the new answers travel; otherwise send the full state
+        const payload = diagSessionId
+            ? { session_id: diagSessionId, answers: pendingAnswers, force_final: forceFinal, language: voiceLang, lookahead_depth: LOOKAHEAD_DEPTH }
+            : { session: true, symptoms: selectedSymptoms, asked_symptoms: askedSymptoms, force_final: forceFinal, language: voiceLang, lookahead_depth: LOOKAHEAD_DEPTH };
+        pendingAnswers = [];
+        questionNode = null;
         const res = await apiFetch('/api/predict', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                symptoms: selectedSymptoms,
-                asked_symptoms: askedSymptoms,
-                force_final: forceFinal,
-                language: voiceLang
-            })
+            body: JSON.stringify(payload)
         });
 
         if (!res) return;
         const data = await res.json();
 
+        if (data.code === 'session_expired') {
+            // Server forgot us: start over with the full lists we keep locally
+            diagSessionId = null;
+            return startDiagnosis(forceFinal);
+        }
+        diagSessionId = data.status === 'question' ? (data.session_id || null) : null;
+        questionNode = data.status === 'question' ? (data.question_tree || null) : null;
+
         if (data.status === 'question') {
             const qText = data.question_text || `Do you also experience <strong>${data.question_symptom}</strong>?`;
             renderQuestion(data.question_symptom, qText);
@@ -432,7 +486,16 @@ function answerQuestion(symptom, isYes) {
         selectedSymptoms.push(symptom);
         renderChips();
     }
-    startDiagnosis();
+    pendingAnswers.push({ symptom: symptom, value: isYes });
+
+    // Walk the precomputed subtree; only go back to the server at a leaf
+    const next = questionNode ? questionNode[isYes ? 'yes' : 'no'] : null;
+    if (next && !next.leaf) {
+        questionNode = next;
+        renderQuestion(next.question_symptom, next.question_text);
+        return;
+    }
+    startDiagnosis(false);
 }
 
 function renderResult(result) {
@@ -516,6 +579,22 @@ function renderResult(result) {
 // --- OTHER TABS ---
 
 // Explain
+function formatExplanation(text) {
+    // 1. Convert **Bold** to <strong>Bold</strong>
+    text = text.replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>');
+
+    // 2. Handle numbered lists better (ensure they start on new lines)
+    // Look for patterns like "1. TITLE:" and ensure a break before them
+    text = text.replace(/(\d+\.\s+[A-Z\s]+:)/g, '<br><br>$1');
+
+    // 3. Convert remaining newlines to <br>
+    text = text.replace(/\n/g, '<br>');
+
+    // 4. Clean up initial double breaks if any
+    if (text.startsWith('<br>')) text = text.substring(4);
+    return text;
+}
+
 async function explainDisease(lang) {
     const disease = document.getElementById('explain-disease-input').value;
     const resContainer = document.getElementById('explain-result-container');
@@ -526,35 +605,17 @@ async function explainDisease(lang) {
     resContainer.classList.remove('hidden');
     resBox.textContent = "Generating explanation...";
 
-    const res = await apiFetch('/api/explain_disease', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ disease, language: lang })
-    });
-    if (!res) return;
-    const data = await res.json();
-
-
-    // Format the text for better display
-    if (data.explanation) {
-        let text = data.explanation;
-
-        // 1. Convert **Bold** to <strong>Bold</strong>
-        text = text.replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>');
-
-        // 2. Handle numbered lists better (ensure they start on new lines)
-        // Look for patterns like "1. TITLE:" and ensure a break before them
-        text = text.replace(/(\d+\.\s+[A-Z\s]+:)/g, '<br><br>$1');
-
-        // 3. Convert remaining newlines to <br>
-        text = text.replace(/\n/g, '<br>');
-
-        // 4. Clean up initial double breaks if any
-        if (text.startsWith('<br>')) text = text.substring(4);
-
-        resBox.innerHTML = text;
-    } else {
-        resBox.textContent = data.error;
+    // Rendered as chunks arrive (live text, cached text or the offline fallback alike)
+    let text = '';
+    try {
+        await streamSSE('/api/explain_disease_stream', { disease, language: lang }, (event) => {
+            if (event.type === 'reset') text = '';
+            else if (event.type === 'chunk') text += event.text;
+            else return;
+            resBox.innerHTML = formatExplanation(text);
+        });
+    } catch (err) {
+        resBox.textContent = err.message;
     }
 }
 
@@ -576,7 +637,21 @@ async function generateReport() {
     btn.innerHTML = '<i class="fa-solid fa-spinner fa-spin"></i> Generating...';
     btn.disabled = true;
 
+    const previewBox = document.getElementById('report-preview');
+    previewBox.textContent = '';
+    previewBox.classList.remove('hidden');
+
     try {
+        // Show the report text while it is written; the server builds the PDF below from the same text
+        let text = '';
+        const streamed = await streamSSE('/api/report_text_stream', { disease, language: reportLang }, (event) => {
+            if (event.type === 'reset') text = '';
+            else if (event.type === 'chunk') text += event.text;
+            else return;
+            previewBox.textContent = text;
+        });
+        if (!streamed) return;
+
         const res = await fetch('/api/generate_report', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
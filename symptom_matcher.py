@@ -0,0 +1,418 @@
+import re
+from functools import lru_cache
+from collections import deque
+
+# Multilingual keyword matcher for local_extract_symptoms
+# One Aho-Corasick automaton per language holds every phrase that names a
+# symptom: the English symptom names, the symptom_translations.json phrases
+# and the colloquial Hindi/Gujarati phrases below. A single pass over the input
+# reports all phrase occurrences; overlapping hits are resolved to the
+# leftmost-longest non-overlapping set (so "सर में दर्द" wins over "दर्द").
+# The automaton is built once at startup, so matching cost depends on the
+# input length, not on how many phrases a language has.
+
+# Spoken and typed input often only shares key words with a phrase, or is
+# romanized ("mujhe bukhar hai"). TokenIndex covers that: an inverted
+# index from normalized tokens of every Hindi/Gujarati phrase (the token
+# itself plus a script-independent phonetic key) to the phrases containing
+# them, scored by the share of the phrase's meaningful tokens found in the input.
+# It only runs for Hindi/Gujarati input: short phonetic keys collide with
+# everyday English ("feet" ~ पीठ, "good" ~ गुदा), and one-word phrases whose
+# key is that short only match as written.
+
+# Everyday phrasings that patients actually say -> official symptom name
+COLLOQUIAL_MAP = {
+    "hi": {
+        "सर में दर्द": "headache", "सर दर्द": "headache", "माथा दर्द": "headache",
+        "पेट में दर्द": "stomach pain", "पेट दर्द": "stomach pain",
+        "बुखार": "fever", "ताप": "fever",
+        "बदन दर्द": "muscle pain", "शरीर दर्द": "muscle pain",
+        "सांस फूलना": "shortness of breath", "सांस लेने में दिक्कत": "shortness of breath",
+        "ठंड": "chills", "कपकपी": "chills",
+        "उल्टी": "vomiting", "जी मिचलाना": "nausea",
+        "दस्त": "diarrhea", "पेचिश": "diarrhea",
+        "खांसी": "cough", "जुकाम": "common cold", "शर्दी": "common cold", # Note: common cold might be a disease, but used as symptom
+        "कमजोरी": "weakness", "थकान": "fatigue",
+        "चक्कर": "dizziness", "खुजली": "itching of skin",
+        "सूजन": "skin swelling", "जलन": "burning",
+        "कब्ज": "constipation"
+    },
+    "gu": {
+        "માથું દુખે": "headache", "માથાનો દુખાવો": "headache",
+        "પેટમાં દુખે": "stomach pain", "પેટનો દુખાવો": "stomach pain",
+        "તાવ": "fever", "ગરમી": "fever",
+        "શરીર દુખે": "muscle pain", "હાડકા દુખે": "muscle pain",
+        "શ્વાસ ચડે": "shortness of breath", "દમ": "shortness of breath",
+        "ઠંડી": "chills", "ધ્રુજારી": "chills",
+        "ઉલટી": "vomiting", "ઓબકા": "nausea",
+        "ઝાડા": "diarrhea", "જુલાબ": "diarrhea",
+        "ખાંસી": "cough", "ઉધરસ": "cough",
+        "શરદી": "cough", "ઝરઝરિયા": "nasal congestion",
+        "અશક્તિ": "weakness", "થાક": "fatigue",
+        "ચક્કર": "dizziness", "ખંજવાળ": "itching of skin",
+        "સોજો": "skin swelling", "બળતરા": "burning",
+        "કબજિયાત": "constipation"
+    }
+}
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over lowercased phrases, each mapped to a value."""
+
+    def __init__(self, phrases):
+        self.goto = [{}] # node -> {char: node}
+        self.fail = [0]
+        self.output = [None] # node -> (length, value) of the phrase ending exactly here
+        self.report = [-1] # node -> nearest node on the fail chain (itself included) with an output
+        for phrase, value in phrases.items():
+            phrase = phrase.lower().strip()
+            if phrase:
+                self._insert(phrase, value)
+        self._link()
+
+    def __len__(self):
+        return sum(1 for out in self.output if out is not None)
+
+    def _insert(self, phrase, value):
+        node = 0
+        for ch in phrase:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.report.append(-1)
+            node = nxt
+        self.output[node] = (len(phrase), value) # Later phrases override earlier ones
+
+    def _link(self):
+        """Breadth-first fail links, plus output links so matching never walks silent nodes."""
+        order = deque()
+        for child in self.goto[0].values():
+            order.append(child)
+        while order:
+            node = order.popleft()
+            self.report[node] = node if self.output[node] is not None else self.report[self.fail[node]]
+            for ch, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                order.append(child)
+
+    def find_all(self, text):
+        """Every (start, end, value) phrase occurrence in text (already lowercased)."""
+        hits = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            out = self.report[node]
+            while out > 0:
+                length, value = self.output[out]
+                hits.append((i + 1 - length, i + 1, value))
+                out = self.report[self.fail[out]]
+        return hits
+
+    def find(self, text):
+        """Leftmost-longest non-overlapping (start, end, value) matches."""
+        hits = sorted(self.find_all(text), key=lambda h: (h[0], h[0] - h[1]))
+        chosen = []
+        taken_until = 0
+        for start, end, value in hits:
+            if start >= taken_until:
+                chosen.append((start, end, value))
+                taken_until = end
+        return chosen
+
+
+def build_symptom_matchers(symptoms, translations):
+    """
+    {language: PhraseAutomaton} for "en" and every language in translations.
+    Each local-language automaton also contains the English names, since
+    patients mix English symptom words into Hindi/Gujarati sentences.
+    """
+    english = {sym.lower(): sym for sym in symptoms}
+    matchers = {"en": PhraseAutomaton(english)}
+    for lang, mapping in translations.items():
+        phrases = dict(english)
+        phrases.update(mapping)
+        phrases.update(COLLOQUIAL_MAP.get(lang, {}))
+        matchers[lang] = PhraseAutomaton(phrases)
+    return matchers
+
+
+# Filler words ignored on both sides of token matching (from debug_matching.py)
+STOPWORDS = {
+    "mane", "k", "ke", "ane", "chhe", "che", "ma", "hu", "thay", "lage",
+    "jevu", "ave", "mate", "thi", "no", "ni", "nu", "na", "pan", "chho",
+    "mujhe", "hai", "ho", "raha", "rahi", "ko", "me", "se", "aur", "ki", "ka",
+    "dukhe", "dukhavo", "dukh", "aave", "lagu", "thavu",
+    # Gujarati Script Stops
+    "મને", "કે", "અને", "છે", "મા", "હું", "થાય", "લાગે", "જેવું", "આવે",
+    "માટે", "થી", "નો", "ની", "નું", "ના", "પણ", "દુખે", "દુખાવો", "દુખ",
+    "થવું", "આવવું", "લાગવું",
+    # Hindi Script Stops
+    "दर्द", "है", "का", "की", "के", "को", "में", "से", "और", "मुझे", "हो", "रहा", "रही", "हूं",
+    "सूजन", "लगना", "आना"
+}
+
+# A phrase matches when more than half of its meaningful tokens are in the
+# input (the prototype's 0.5 let "तेज" alone pick "sharp chest pain")
+MIN_TOKEN_RATIO = 0.6
+MIN_KEY_LENGTH = 2 # Shorter phonetic keys collide too often
+MIN_SINGLE_KEY_LENGTH = 4 # One-word phrases with shorter keys ("हाथ" -> "at") need the exact token
+TOKEN_INDEX_LANGUAGES = ("hi", "gu")
+
+TOKEN_SPLIT = re.compile(r"[\s,.;:!?\"'()\[\]{}।॥/\\-]+")
+
+# Devanagari -> Latin; Gujarati shares the layout 0x180 code points higher
+DEVANAGARI_VOWELS = {
+    "अ": "a", "आ": "aa", "इ": "i", "ई": "ii", "उ": "u", "ऊ": "uu", "ऋ": "ri",
+    "ऍ": "e", "ए": "e", "ऐ": "ai", "ऑ": "o", "ओ": "o", "औ": "au"
+}
+DEVANAGARI_MATRAS = {
+    "ा": "aa", "ि": "i", "ी": "ii", "ु": "u", "ू": "uu", "ृ": "ri",
+    "ॅ": "e", "े": "e", "ै": "ai", "ॉ": "o", "ो": "o", "ौ": "au"
+}
+DEVANAGARI_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n", "ऩ": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ऱ": "r", "ल": "l", "ळ": "l", "ऴ": "l", "व": "v",
+    "श": "sh", "ष": "sh", "स": "s", "ह": "h" # Nukta forms (क़, ज़, ड़ ...) fall back to the base letter
+}
+VIRAMA, ANUSVARA, CHANDRABINDU, VISARGA, NUKTA = "्", "ं", "ँ", "ः", "़"
+
+
+def to_devanagari(ch):
+    code = ord(ch)
+    return chr(code - 0x180) if 0x0A80 <= code <= 0x0AFF else ch
+
+
+def transliterate(token):
+    """Rough Latin spelling of a Devanagari/Gujarati token; Latin input is returned lowercased."""
+    chars = [to_devanagari(ch) for ch in token.lower() if to_devanagari(ch) != NUKTA]
+    out = []
+    for i, ch in enumerate(chars):
+        nxt = chars[i + 1] if i + 1 < len(chars) else None
+        if ch in DEVANAGARI_CONSONANTS:
+            out.append(DEVANAGARI_CONSONANTS[ch])
+            # Inherent vowel unless a matra/virama follows (or at the word end)
+            if nxt is not None and nxt not in DEVANAGARI_MATRAS and nxt != VIRAMA:
+                out.append("a")
+        elif ch in DEVANAGARI_MATRAS:
+            out.append(DEVANAGARI_MATRAS[ch])
+        elif ch in DEVANAGARI_VOWELS:
+            out.append(DEVANAGARI_VOWELS[ch])
+        elif ch == ANUSVARA:
+            out.append("n" if nxt is not None else "") # Final nasal is rarely typed ("mathu")
+        elif ch == VISARGA:
+            out.append("h")
+        elif ch not in (VIRAMA, CHANDRABINDU):
+            out.append(ch)
+    return "".join(out)
+
+
+def _collapse(text):
+    return re.sub(r"(.)\1+", r"\1", text)
+
+
+SPELLING_VARIANTS = str.maketrans({"w": "v", "z": "j", "q": "k", "f": "p"})
+
+
+@lru_cache(maxsize=65536) # Spoken vocabulary is small; repeat tokens skip the rewrite
+def phonetic_key(token):
+    """
+    Spelling-tolerant key shared by native-script and romanized forms:
+    "માથું", "maathu" and "mathu" all become "mtu".
+    """
+    latin = re.sub(r"[^a-z]", "", transliterate(token))
+    latin = latin.replace("ee", "i").replace("oo", "u")
+    latin = latin.translate(SPELLING_VARIANTS)
+    latin = _collapse(latin.replace("h", "")) # Aspiration is spelled inconsistently
+    if len(latin) > 1:
+        latin = latin[0] + latin[1:].replace("a", "") # Schwa and long/short a differ by speaker
+    return _collapse(latin)
+
+
+def tokenize(text):
+    return [t for t in TOKEN_SPLIT.split(text.lower()) if t]
+
+
+STOPWORD_KEYS = {phonetic_key(w) for w in STOPWORDS}
+
+
+# English filler, only used to decide how much of an input the local matchers understood
+ENGLISH_FILLER = {
+    "i", "im", "i'm", "me", "my", "mine", "we", "our", "he", "she", "his", "her", "they", "their",
+    "have", "has", "had", "having", "am", "is", "are", "was", "were", "be", "been", "feel", "feeling",
+    "a", "an", "the", "and", "or", "but", "with", "without", "of", "in", "on", "at", "to", "for",
+    "from", "since", "also", "very", "too", "some", "bit", "little", "lot", "much", "really",
+    "got", "get", "getting", "there", "it", "its", "this", "that", "do", "does", "not", "no",
+    "patient", "reports", "complains", "doctor", "please", "help", "days", "day", "weeks", "since",
+    "today", "yesterday", "morning", "night", "evening", "last", "two", "three", "few"
+}
+
+
+def token_forms(token):
+    """Index forms of a token, or None for a stopword."""
+    key = phonetic_key(token)
+    if token in STOPWORDS or key in STOPWORD_KEYS:
+        return None
+    return {token, key} if len(key) >= MIN_KEY_LENGTH else {token}
+
+
+def is_content_token(token):
+    """Tokens that carry meaning: not a stopword, not English filler, contains a letter."""
+    return (token not in ENGLISH_FILLER and token_forms(token) is not None
+            and any(ch.isalpha() for ch in token))
+
+
+class TokenIndex:
+    """Inverted index: token form -> (phrase id, token position) for phrase -> symptom mappings."""
+
+    def __init__(self, phrases, min_ratio=MIN_TOKEN_RATIO):
+        self.min_ratio = min_ratio
+        self.entries = [] # phrase id -> (symptom, meaningful token count)
+        self.index = {}
+        for phrase, symptom in phrases.items():
+            tokens = list(dict.fromkeys(t for t in tokenize(phrase) if token_forms(t) is not None)) # "भय और भय"
+            if not tokens:
+                continue
+            if len(tokens) == 1 and len(phonetic_key(tokens[0])) < MIN_SINGLE_KEY_LENGTH:
+                forms = [{tokens[0]}]
+            else:
+                forms = [token_forms(t) for t in tokens]
+            entry = len(self.entries)
+            self.entries.append((symptom, len(forms)))
+            for position, variants in enumerate(forms):
+                for form in variants:
+                    self.index.setdefault(form, set()).add((entry, position))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def match(self, text):
+        """{symptom: score} where score is the matched-token ratio of its best phrase."""
+        return self.analyze(text)["found"]
+
+    def analyze(self, text):
+        """
+        found: {symptom: ratio} for phrases at or above min_ratio. Each input
+        token supports at most one phrase; full matches are assigned first.
+        partial: {symptom: ratio} for phrases sharing some tokens but below min_ratio.
+        unmatched: content tokens of text that no found phrase used.
+        unhinted: the unmatched tokens that did not occur in any phrase at all.
+        """
+        tokens = tokenize(text)
+        matched = {} # phrase id -> {phrase token position: input token index}
+        for i, token in enumerate(tokens):
+            for form in token_forms(token) or ():
+                for entry, position in self.index.get(form, ()):
+                    matched.setdefault(entry, {}).setdefault(position, i)
+
+        scored = []
+        partial = {}
+        for entry, positions in matched.items():
+            ratio = len(positions) / self.entries[entry][1]
+            if ratio >= self.min_ratio:
+                scored.append((ratio, len(positions), entry, set(positions.values())))
+            else:
+                symptom = self.entries[entry][0]
+                partial[symptom] = max(partial.get(symptom, 0.0), round(ratio, 4))
+        scored.sort(key=lambda s: (-s[0], -s[1], s[2]))
+
+        used = set()
+        found = {}
+        for ratio, _, entry, inputs in scored:
+            if inputs & used:
+                continue
+            used |= inputs
+            symptom = self.entries[entry][0]
+            found[symptom] = max(found.get(symptom, 0.0), round(ratio, 4))
+        hinted = {i for positions in matched.values() for i in positions.values()}
+        unmatched = [i for i, t in enumerate(tokens) if i not in used and is_content_token(t)]
+        return {"found": found, "partial": partial, "unmatched": [tokens[i] for i in unmatched],
+                "unhinted": [tokens[i] for i in unmatched if i not in hinted]}
+
+
+def build_token_index(translations):
+    """One index over all Hindi/Gujarati phrases: romanized input does not say which of the two it is."""
+    phrases = {}
+    for lang, mapping in translations.items():
+        phrases.update(mapping)
+        phrases.update(COLLOQUIAL_MAP.get(lang, {}))
+    return TokenIndex(phrases)
+
+
+def match_symptom_text(text, lang_key, matchers, token_index):
+    """
+    Local symptom matching for one input. found: symptom names; partial:
+    {symptom: ratio} near misses; unmatched: content tokens nothing explained;
+    unhinted: unmatched tokens that are not in any indexed phrase either.
+    """
+    text = text.lower().strip()
+    found = set()
+
+    # 1. Exact phrases in one pass; longest wins where phrases overlap ("सर में दर्द" over "दर्द")
+    remaining = text
+    for start, end, value in matchers.get(lang_key, matchers["en"]).find(text):
+        found.add(value)
+        remaining = remaining[:start] + " " * (end - start) + remaining[end:]
+
+    # 2. Key words of a Hindi/Gujarati phrase, in either script or romanized
+    if lang_key not in TOKEN_INDEX_LANGUAGES:
+        unmatched = [t for t in tokenize(remaining) if is_content_token(t)]
+        return {"found": found, "partial": {}, "unmatched": unmatched, "unhinted": unmatched}
+    analysis = token_index.analyze(remaining)
+    found.update(analysis["found"])
+    return dict(analysis, found=found)
+
+
+class SymptomVocabulary:
+    """
+    English symptom names indexed by word and by word trigram, to shortlist the
+    names an unmatched input word could refer to ("stomache" -> "stomach pain").
+    """
+
+    def __init__(self, symptoms, min_similarity=0.5):
+        self.min_similarity = min_similarity
+        self.words = {} # word -> symptoms containing it
+        for symptom in symptoms:
+            for word in re.findall(r"[a-z]+", symptom.lower()):
+                if word not in ENGLISH_FILLER and len(word) > 2:
+                    self.words.setdefault(word, []).append(symptom)
+        self.word_grams = {word: _trigrams(word) for word in self.words}
+        self.gram_index = {}
+        for word, grams in self.word_grams.items():
+            for gram in grams:
+                self.gram_index.setdefault(gram, set()).add(word)
+
+    def candidates(self, tokens, limit=40):
+        """Symptom names sharing a (possibly misspelled) word with tokens, best first."""
+        scores = {}
+        for token in tokens:
+            if not re.fullmatch(r"[a-z]+", token) or len(token) < 3:
+                continue
+            grams = _trigrams(token)
+            nearby = set().union(*(self.gram_index.get(g, ()) for g in grams))
+            for word in nearby:
+                other = self.word_grams[word]
+                sim = 2 * len(grams & other) / (len(grams) + len(other))
+                if sim >= self.min_similarity:
+                    for symptom in self.words[word]:
+                        scores[symptom] = max(scores.get(symptom, 0.0), sim)
+        ranked = sorted(scores, key=lambda s: (-scores[s], s))
+        return ranked[:limit]
+
+
+def _trigrams(word):
+    padded = f"#{word}#"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
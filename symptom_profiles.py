@@ -0,0 +1,192 @@
+import os
+import sys
+import subprocess
+import numpy as np
+
+# Disease x Symptom frequency matrix
+# Row = disease, Column = symptom, Value = fraction of that disease's training rows
+# where the symptom is present. Built once so the refinement question can be
+# picked with a single row-slice instead of a groupby per symptom column.
+
+PROFILE_PATH = os.path.join("data", "symptom_profiles.npz")
+
+
+class SymptomProfiles:
+    def __init__(self, diseases, symptoms, freq):
+        self.diseases = [str(d) for d in diseases]
+        self.symptoms = [str(s).strip() for s in symptoms]
+        self.freq = np.asarray(freq, dtype=np.float64)
+        self.disease_index = {d: i for i, d in enumerate(self.diseases)}
+        self.symptom_index = {s: i for i, s in enumerate(self.symptoms)}
+
+    @classmethod
+    def from_frame(cls, df, label_col="diseases"):
+        """Builds the profile matrix from the raw training DataFrame (one groupby)."""
+        grouped = df.groupby(label_col, sort=True).mean()
+        return cls(grouped.index.tolist(), grouped.columns.tolist(), grouped.to_numpy(dtype=np.float64))
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        """Same matrix from the packed uint8 dataset (dataset_store.SymptomDataset)."""
+        codes = np.asarray(dataset.label_codes)
+        counts = np.bincount(codes, minlength=len(dataset.label_names))
+        present = np.flatnonzero(counts)
+        order = np.argsort(codes, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts[present])[:-1]])
+        sums = np.add.reduceat(dataset.X[order], starts, axis=0, dtype=np.int64)
+        freq = sums / counts[present][:, None]
+        return cls(np.asarray(dataset.label_names)[present], dataset.columns, freq)
+
+    @classmethod
+    def load(cls, path=PROFILE_PATH):
+        with np.load(path, allow_pickle=False) as npz:
+            return cls(npz["diseases"].tolist(), npz["symptoms"].tolist(), npz["freq"])
+
+    def save(self, path=PROFILE_PATH, source_meta=None):
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with open(tmp, "wb") as f: # A file object keeps numpy from appending ".npz"
+            np.savez_compressed(
+                f,
+                diseases=np.array(self.diseases),
+                symptoms=np.array(self.symptoms),
+                freq=self.freq,
+                **(source_meta or {})
+            )
+        os.replace(tmp, path) # Several workers may rebuild at once; readers never see a partial file
+
+    def aligned_to(self, class_names):
+        """
+        Returns a copy whose rows follow the model's class order (le.classes_),
+        so row i lines up with column i of predict_proba. Classes missing from
+        the profile get an all-zero row.
+        """
+        if [str(c) for c in class_names] == self.diseases:
+            return self # Already aligned (keeps shared/memory-mapped rows shared)
+        freq = np.zeros((len(class_names), len(self.symptoms)), dtype=np.float64)
+        for i, name in enumerate(class_names):
+            row = self.disease_index.get(str(name))
+            if row is not None:
+                freq[i] = self.freq[row]
+        return SymptomProfiles(class_names, self.symptoms, freq)
+
+    def rows_for(self, diseases):
+        """Matrix row indices for the given disease names (unknown names are skipped)."""
+        return [self.disease_index[d] for d in diseases if d in self.disease_index]
+
+    def exclusion_mask(self, *symptom_groups):
+        """Boolean mask over symptom columns that are already known or asked."""
+        mask = np.zeros(len(self.symptoms), dtype=bool)
+        for group in symptom_groups:
+            for s in group:
+                idx = self.symptom_index.get(str(s).strip())
+                if idx is not None:
+                    mask[idx] = True
+        return mask
+
+    def discriminating_symptom(self, candidates, current_symptoms, asked_symptoms):
+        """
+        Returns the unasked symptom whose frequency varies most across the
+        candidate diseases, or None if nothing is left to ask.
+        """
+        rows = self.rows_for(candidates)
+        if not rows:
+            return None
+
+        block = self.freq[rows]
+        if len(rows) > 1:
+            variance = block.var(axis=0, ddof=1)
+        else:
+            # Same as pandas: variance of a single profile is undefined -> 0
+            variance = np.zeros(block.shape[1])
+
+        variance[self.exclusion_mask(current_symptoms, asked_symptoms)] = -np.inf
+        best = int(np.argmax(variance))
+        if variance[best] == -np.inf:
+            return None
+        return self.symptoms[best]
+
+    def information_gain_symptom(self, predict_proba, input_vector, posterior,
+                                 current_symptoms, asked_symptoms, max_candidates=64):
+        """
+        Returns the unasked symptom with the highest expected reduction in the
+        entropy of the classifier's posterior, or None if nothing is left to ask.
+
+        Rows must be aligned to the model's classes (see aligned_to).
+        All "yes" hypotheticals are scored with ONE batched predict_proba call.
+        A "no" answer leaves the model input unchanged (absent == not reported),
+        so the "no" branch is a Bayes update of the current posterior with the
+        profile likelihood of the symptom being absent.
+        """
+        posterior = np.asarray(posterior, dtype=np.float64)
+        total = posterior.sum()
+        if total <= 0:
+            return None
+        posterior = posterior / total
+        input_vector = np.asarray(input_vector, dtype=np.float32)
+
+        # Predictive probability that the patient answers "yes" to each symptom
+        p_yes = posterior @ self.freq
+
+        excluded = self.exclusion_mask(current_symptoms, asked_symptoms) | (input_vector > 0)
+        open_idx = np.flatnonzero(~excluded & (p_yes > 0) & (p_yes < 1))
+        if open_idx.size == 0:
+            return None
+
+        # Bound per-turn cost: keep the most uncertain questions only
+        if open_idx.size > max_candidates:
+            spread = p_yes[open_idx] * (1 - p_yes[open_idx])
+            open_idx = open_idx[np.argsort(spread)[::-1][:max_candidates]]
+
+        # Stack one "what if yes" row per candidate symptom
+        what_if = np.repeat(input_vector[None, :], open_idx.size, axis=0)
+        what_if[np.arange(open_idx.size), open_idx] = 1
+        yes_post = np.asarray(predict_proba(what_if), dtype=np.float64)
+
+        no_post = posterior[None, :] * (1 - self.freq[:, open_idx].T)
+        no_mass = no_post.sum(axis=1, keepdims=True)
+        no_post = np.divide(no_post, no_mass, out=np.zeros_like(no_post), where=no_mass > 0)
+
+        py = p_yes[open_idx]
+        expected = py * _entropy(yes_post) + (1 - py) * _entropy(no_post)
+        gain = _entropy(posterior[None, :])[0] - expected
+        return self.symptoms[int(open_idx[int(np.argmax(gain))])]
+
+
+def _entropy(dist):
+    """Row-wise Shannon entropy (bits) of a 2D array of distributions."""
+    dist = np.clip(dist, 1e-12, 1.0)
+    return -(dist * np.log2(dist)).sum(axis=1)
+
+
+def build_profile_artifact(path=PROFILE_PATH):
+    """Dataset -> profile matrix artifact, stamped with the CSV fingerprint for staleness checks."""
+    from dataset_store import load_dataset, source_metadata, DATASET_CSV
+    print("Loading data...")
+    profiles = SymptomProfiles.from_dataset(load_dataset())
+    meta = source_metadata(DATASET_CSV) if os.path.exists(DATASET_CSV) else None
+    profiles.save(path, source_meta=meta)
+    print(f"Saved {len(profiles.diseases)} x {len(profiles.symptoms)} profile matrix to {path}")
+    return profiles
+
+
+def ensure_profile_artifact(path=PROFILE_PATH):
+    """
+    Rebuilds the profile artifact in a child process if it is missing or older
+    than the CSV, so the raw dataset is never materialized in the calling
+    (web) process.
+    """
+    from dataset_store import artifact_is_current, DATASET_CSV
+    if not artifact_is_current(DATASET_CSV, path):
+        print("Profile artifact missing or stale, rebuilding in a subprocess...")
+        subprocess.run([sys.executable, os.path.abspath(__file__), path], check=True)
+
+
+def load_profile_artifact(path=PROFILE_PATH):
+    """Light serving path: loads only the (up to date) profile artifact."""
+    ensure_profile_artifact(path)
+    return SymptomProfiles.load(path)
+
+
+if __name__ == "__main__":
+    # Build step: python symptom_profiles.py [output.npz]
+    build_profile_artifact(sys.argv[1] if len(sys.argv) > 1 else PROFILE_PATH)
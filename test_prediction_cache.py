@@ -0,0 +1,23 @@
+from prediction_cache import PredictionCache
+
+# Cached predictions must always belong to the model that computed them.
+
+
+def test_results_are_cached_under_the_version_read_with_the_model(tmp_path):
+    model_file = tmp_path / "model.npz"
+    model_file.write_bytes(b"old")
+    cache = PredictionCache(paths=(str(model_file),))
+    old = cache.version
+    assert cache.put(["fever"], False, {"probs": "old"}, old)
+    assert cache.get(["fever"], False, old) == {"probs": "old"}
+
+    model_file.write_bytes(b"new model")
+    new = cache.changed_version()
+    assert new is not None and cache.version == old # Nothing moves until the new model is serving
+
+    assert cache.advance(new) and not cache.advance(new)
+    assert cache.get(["fever"], False, new) is None
+    # A request that started on the old model cannot store its answer under the new version
+    assert not cache.put(["fever"], False, {"probs": "old"}, old)
+    assert cache.get(["fever"], False, new) is None
+    assert cache.changed_version() is None
@@ -0,0 +1,40 @@
+import json
+import os
+
+from symptom_matcher import build_symptom_matchers, build_token_index, match_symptom_text
+
+# Local symptom matching against the shipped translations: English words must
+# not hit Hindi/Gujarati phrases through their phonetic keys.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(HERE, "data", "symptom_translations.json"), encoding="utf-8") as f:
+    TRANSLATIONS = json.load(f)
+SYMPTOMS = sorted({s for mapping in TRANSLATIONS.values() for s in mapping.values()})
+MATCHERS = build_symptom_matchers(SYMPTOMS, TRANSLATIONS)
+TOKEN_INDEX = build_token_index(TRANSLATIONS)
+
+
+def found(text, lang):
+    return match_symptom_text(text, lang, MATCHERS, TOKEN_INDEX)["found"]
+
+
+def test_plain_english_matches_nothing():
+    for text in ["I feel good today", "my feet are swollen", "pain stops by evening",
+                 "look at this", "he came by bus", "we ate rice at home"]:
+        assert found(text, "en") == set(), text
+
+
+def test_english_words_in_hindi_input_need_the_exact_token():
+    # हाथ, गुदा, पीठ, भय have phonetic keys shorter than MIN_SINGLE_KEY_LENGTH
+    for text in ["at", "good", "feet", "by"]:
+        assert not (found(text, "hi") & {"pain of the anus", "back pain", "fears and phobias"}), text
+
+
+def test_english_symptom_names_still_match():
+    assert found("fever with vomiting and chills", "en") == {"fever", "vomiting", "chills"}
+
+
+def test_romanized_and_native_hindi_match():
+    assert "fever" in found("mujhe bukhar hai", "hi")
+    assert "fever" in found("मुझे बुखार है", "hi")
+    assert "back pain" in found("पीठ", "hi")
@@ -0,0 +1,35 @@
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier
+from sklearn.preprocessing import LabelEncoder
+
+from tree_engine import compile_forest, export_compiled_forest, CompiledForest
+
+# The compiled NumPy engine must reproduce sklearn's predict_proba exactly
+# (up to float rounding) on the binary symptom vectors the app feeds it.
+
+
+def fitted_forest(seed=0):
+    rng = np.random.default_rng(seed)
+    X = (rng.random((300, 25)) < 0.2).astype(np.float32)
+    names = np.array(["flu", "cold", "migraine", "gastritis", "allergy"])[(X[:, :5].argmax(axis=1) + X[:, 5:].sum(axis=1).astype(int)) % 5]
+    le = LabelEncoder().fit(names)
+    model = ExtraTreesClassifier(n_estimators=15, random_state=seed).fit(X, le.transform(names))
+    return model, le, rng
+
+
+def test_compiled_forest_matches_sklearn():
+    model, le, rng = fitted_forest()
+    engine = CompiledForest(compile_forest(model, le))
+    X = (rng.random((200, 25)) < 0.2).astype(np.float32)
+    assert np.allclose(engine.predict_proba(X), model.predict_proba(X), atol=1e-6)
+    assert np.array_equal(engine.predict(X), model.predict(X))
+    assert list(engine.labels.classes_) == list(le.classes_)
+
+
+def test_single_row_and_round_trip(tmp_path):
+    model, le, rng = fitted_forest(seed=1)
+    path = tmp_path / "compiled.npz"
+    export_compiled_forest(model, le, path)
+    engine = CompiledForest.load(path)
+    row = (rng.random(25) < 0.3).astype(np.float32)
+    assert np.allclose(engine.predict_proba(row), model.predict_proba(row[None, :]), atol=1e-6)
@@ -1,13 +1,17 @@
+import sys
 import pandas as pd
 import numpy as np
 import joblib
 from sklearn.ensemble import ExtraTreesClassifier
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
+from tree_engine import export_compiled_forest, COMPILED_MODEL_PATH
+from dataset_store import load_dataframe
+from differential_table import build_table
 
 def train():
     print("Loading data...")
-    df = pd.read_csv("data/Diseases_and_Symptoms_data.csv")
+    df = load_dataframe()
     
     # Prepare X (features) and y (target)
     X = df.drop("diseases", axis=1)
@@ -31,6 +35,13 @@ def train():
     joblib.dump(model, "disease_model.pkl")
     print("Model saved successfully.")
     
+    # Export flattened trees for the NumPy serving engine
+    export_compiled_forest(model, le)
+    print(f"Compiled model saved to {COMPILED_MODEL_PATH}.")
+    
+    # Precomputed answers for common symptom combinations (tied to this model version)
+    build_table()
+    
     # Test Prediction
     print("\nVerifying model...")
     test_symptom = "pain_chest" # Try to find a valid column
@@ -47,5 +58,17 @@ def train():
     pred_name = le.inverse_transform(pred)[0]
     print(f"Prediction: {pred_name}")
 
+def export():
+    """Compiles the existing disease_model.pkl without retraining."""
+    print("Loading model...")
+    model = joblib.load("disease_model.pkl")
+    le = joblib.load("label_encoder.pkl")
+    export_compiled_forest(model, le)
+    print(f"Compiled {len(model.estimators_)} trees to {COMPILED_MODEL_PATH}.")
+    build_table()
+
 if __name__ == "__main__":
-    train()
+    if "--export" in sys.argv:
+        export()
+    else:
+        train()
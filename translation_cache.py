@@ -0,0 +1,198 @@
+import os
+import time
+import json
+import atexit
+import sqlite3
+import hashlib
+import threading
+
+# Persistent translation cache for translate_info
+# The payload being translated is the static get_detailed_info(disease) dict,
+# so each (disease, language, content version) only needs one Gemini call.
+# Entries live in a SQLite file (WAL mode) that every worker process opens, so
+# a disease translated by one worker is a hit for all of them and survives
+# restarts. Least recently used rows are evicted past max_entries / max_bytes.
+# Reads stay read-only: hits are buffered and their last_used/hits updates are
+# written in one transaction every touch_batch hits or touch_interval seconds,
+# and the entry/byte totals are tracked in memory (re-read from the file every
+# resync_every writes, to pick up the other workers' inserts).
+
+TRANSLATION_CACHE_PATH = os.path.join("data", "translation_cache.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    disease TEXT NOT NULL,
+    language TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (disease, language, content_hash)
+);
+CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used);
+"""
+
+
+def content_hash(info):
+    """Stable hash of the source payload: edits to the source data start a new cache entry."""
+    blob = json.dumps(info, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+class TranslationCache:
+    def __init__(self, path=TRANSLATION_CACHE_PATH, max_entries=5000, max_bytes=50 * 1024 * 1024,
+                 touch_batch=64, touch_interval=30.0, resync_every=100):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.touch_batch = touch_batch
+        self.touch_interval = touch_interval
+        self.resync_every = resync_every
+        self._local = threading.local() # sqlite3 connections are per thread
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        self._touched = {} # key -> [last_used, pending hits], not yet written
+        self._last_flush = time.time()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._resync_totals(self._connect())
+        atexit.register(self.flush) # Don't lose the last batch of hits on shutdown
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL") # Readers never block the writer across workers
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, disease, language, info):
+        """Cached translation of info, or None."""
+        key = (disease, language, content_hash(info))
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT payload FROM translations WHERE disease=? AND language=? AND content_hash=?", key
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            self._touch(key)
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Translation Cache Error: {e}")
+            self._count("errors")
+            return None
+
+    def _touch(self, key):
+        """Counts a hit; the last_used/hits update is buffered and flushed in batches."""
+        now = time.time()
+        with self._lock:
+            self.hits += 1
+            pending = self._touched.setdefault(key, [now, 0])
+            pending[0] = now
+            pending[1] += 1
+            due = len(self._touched) >= self.touch_batch or now - self._last_flush >= self.touch_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered last_used/hits updates in one transaction."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            self._last_flush = time.time()
+        if not touched:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "UPDATE translations SET last_used=MAX(last_used, ?), hits=hits+? WHERE disease=? AND language=? AND content_hash=?",
+                    [(last_used, hits) + key for key, (last_used, hits) in touched.items()]
+                )
+        except sqlite3.Error as e:
+            print(f"Translation Cache Error: {e}")
+            self._count("errors")
+
+    def _resync_totals(self, conn):
+        count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM translations").fetchone()
+        with self._lock:
+            self._entries, self._bytes = count, size
+        return count, size
+
+    def put(self, disease, language, info, translated):
+        now = time.time()
+        key = (disease, language, content_hash(info))
+        payload = json.dumps(translated, ensure_ascii=False)
+        try:
+            conn = self._connect()
+            with conn:
+                old = conn.execute(
+                    "SELECT LENGTH(payload) FROM translations WHERE disease=? AND language=? AND content_hash=?", key
+                ).fetchone()
+                conn.execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, 0)", key + (payload, now, now))
+            with self._lock:
+                self.writes += 1
+                self._entries += 0 if old else 1
+                self._bytes += len(payload) - (old[0] if old else 0)
+                resync = self.writes % self.resync_every == 0
+            self._evict(conn, resync)
+        except sqlite3.Error as e:
+            print(f"Translation Cache Error: {e}")
+            self._count("errors")
+
+    def _evict(self, conn, resync=False):
+        """Drops least recently used rows until both the entry and the byte budget hold."""
+        with self._lock:
+            count, size = self._entries, self._bytes
+        if not resync and count <= self.max_entries and size <= self.max_bytes:
+            return
+        count, size = self._resync_totals(conn) # Exact totals, including other workers' rows
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        self.flush() # Recent hits must count before choosing what to drop
+        removed = 0
+        with conn:
+            for rowid, length in conn.execute("SELECT rowid, LENGTH(payload) FROM translations ORDER BY last_used").fetchall():
+                if count <= self.max_entries and size <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM translations WHERE rowid=?", (rowid,))
+                count -= 1
+                size -= length
+                removed += 1
+        with self._lock:
+            self.evictions += removed
+            self._entries, self._bytes = count, size
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes
+        }
+        self.flush()
+        try:
+            # Shared totals across all workers
+            entries, size, total_hits = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0), COALESCE(SUM(hits), 0) FROM translations"
+            ).fetchone()
+            stats.update(entries=entries, bytes=size, lifetime_hits=total_hits)
+        except sqlite3.Error:
+            pass
+        return stats
@@ -0,0 +1,146 @@
+import os
+import numpy as np
+
+# Compiled inference engine for the ExtraTreesClassifier
+# train_model.py flattens every tree of disease_model.pkl into a handful of
+# contiguous NumPy arrays. The serving process only needs NumPy to walk them,
+# so it skips sklearn's per-call validation/dispatch (and the sklearn import).
+
+COMPILED_MODEL_PATH = "disease_model_compiled.npz"
+
+
+def compile_forest(model, label_encoder):
+    """Flattens a fitted sklearn forest into the array layout used by CompiledForest."""
+    features, thresholds, children, roots = [], [], [], []
+    leaf_ptr, leaf_class, leaf_prob = [np.zeros(1, dtype=np.int64)], [], []
+    offset = 0
+    max_depth = 0
+    n_trees = len(model.estimators_)
+
+    for est in model.estimators_:
+        tree = est.tree_
+        n = tree.node_count
+        left = tree.children_left.astype(np.int64)
+        right = tree.children_right.astype(np.int64)
+        is_leaf = left == -1
+        node_ids = np.arange(n)
+
+        # Leaves point at themselves so every row can be walked a fixed number of steps
+        left = np.where(is_leaf, node_ids, left) + offset
+        right = np.where(is_leaf, node_ids, right) + offset
+        children.append(np.stack([left, right], axis=1))
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        roots.append(offset)
+
+        # Sparse, pre-averaged leaf distributions (most leaves hold one class)
+        leaf_nodes = np.flatnonzero(is_leaf)
+        leaf_values = tree.value[leaf_nodes, 0, :]
+        r, c = np.nonzero(leaf_values)
+        leaf_class.append(c)
+        leaf_prob.append(leaf_values[r, c] / leaf_values.sum(axis=1)[r] / n_trees)
+        per_node = np.zeros(n, dtype=np.int64)
+        per_node[leaf_nodes] = np.bincount(r, minlength=len(leaf_nodes))
+        leaf_ptr.append(per_node)
+
+        max_depth = max(max_depth, tree.max_depth)
+        offset += n
+
+    return {
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float32),
+        "children": np.concatenate(children).astype(np.int32),
+        "roots": np.array(roots, dtype=np.int32),
+        "leaf_ptr": np.cumsum(np.concatenate(leaf_ptr)),
+        "leaf_class": np.concatenate(leaf_class).astype(np.int32),
+        "leaf_prob": np.concatenate(leaf_prob).astype(np.float32),
+        "max_depth": np.array(max_depth, dtype=np.int32),
+        "n_features": np.array(model.n_features_in_, dtype=np.int32),
+        "label_names": np.asarray(label_encoder.classes_).astype(str),
+    }
+
+
+def export_compiled_forest(model, label_encoder, path=COMPILED_MODEL_PATH):
+    arrays = compile_forest(model, label_encoder)
+    np.savez(path, **arrays)
+    return arrays
+
+
+class CompiledLabels:
+    """Minimal stand-in for the fitted LabelEncoder (classes_ / inverse_transform)."""
+
+    def __init__(self, names):
+        self.classes_ = np.asarray(names)
+
+    def inverse_transform(self, indices):
+        return self.classes_[np.asarray(indices, dtype=np.int64)]
+
+
+class CompiledForest:
+    """NumPy-only evaluator with the same predict_proba contract as the sklearn forest."""
+
+    def __init__(self, arrays):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.children = arrays["children"]
+        self.roots = arrays["roots"]
+        self.leaf_ptr = arrays["leaf_ptr"]
+        self.leaf_class = arrays["leaf_class"]
+        self.leaf_prob = arrays["leaf_prob"]
+        self.max_depth = int(arrays["max_depth"])
+        self.n_features_in_ = int(arrays["n_features"])
+        self.labels = CompiledLabels(arrays["label_names"])
+        self.n_classes = len(self.labels.classes_)
+        self.classes_ = np.arange(self.n_classes)
+
+    @classmethod
+    def load(cls, path=COMPILED_MODEL_PATH):
+        with np.load(path, allow_pickle=False) as npz:
+            return cls({k: npz[k] for k in npz.files})
+
+    def apply(self, X):
+        """Leaf node id reached in every tree, shape (n_rows, n_trees)."""
+        n = X.shape[0]
+        rows = np.arange(n)[:, None]
+        nodes = np.broadcast_to(self.roots, (n, len(self.roots))).copy()
+        for step in range(self.max_depth):
+            go_right = X[rows, self.feature[nodes]] > self.threshold[nodes]
+            nxt = self.children[nodes, go_right.view(np.int8)]
+            # Stop early once every tree has settled on its (self-looping) leaf
+            if step % 4 == 3 and np.array_equal(nxt, nodes):
+                return nxt
+            nodes = nxt
+        return nodes
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        n = X.shape[0]
+        leaves = self.apply(X).ravel()
+
+        # Gather every reached leaf's sparse distribution and sum per row
+        starts = self.leaf_ptr[leaves]
+        lengths = self.leaf_ptr[leaves + 1] - starts
+        total = int(lengths.sum())
+        row_ids = np.repeat(np.repeat(np.arange(n), len(self.roots)), lengths)
+        within = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        pos = np.repeat(starts, lengths) + within
+
+        flat = np.bincount(
+            row_ids * self.n_classes + self.leaf_class[pos],
+            weights=self.leaf_prob[pos],
+            minlength=n * self.n_classes
+        )
+        return flat.reshape(n, self.n_classes)
+
+    def predict(self, X):
+        return np.argmax(self.predict_proba(X), axis=1)
+
+
+def is_compiled_model_current(path=COMPILED_MODEL_PATH, sources=("disease_model.pkl", "label_encoder.pkl")):
+    """True if the compiled artifact exists and is not older than the pickles it came from."""
+    if not os.path.exists(path):
+        return False
+    built = os.path.getmtime(path)
+    return all(not os.path.exists(src) or os.path.getmtime(src) <= built for src in sources)
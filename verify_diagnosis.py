@@ -1,14 +1,14 @@
 import joblib
 import pandas as pd
 import numpy as np
+from dataset_store import load_dataset
 
 def verify():
     # Load model and data
     try:
         model = joblib.load("disease_model.pkl")
         le = joblib.load("label_encoder.pkl")
-        df = pd.read_csv("data/Diseases_and_Symptoms_data.csv")
-        symptoms_list = df.drop("diseases", axis=1).columns.tolist()
+        symptoms_list = load_dataset().columns
     except Exception as e:
         print(f"Error loading: {e}")
         return